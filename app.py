@@ -11,6 +11,7 @@ def plot_to_base64(fig):
 import plotly.express as px
 import numpy as np
 import pandas as pd
+import plotly.graph_objects as go
 import re
 from textblob import TextBlob
 from scipy.stats import entropy
@@ -38,55 +39,679 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+# Struktur data hasil analisis
+from collections.abc import Mapping
+
+class _Simpul:
+    __slots__ = ('anak', 'awal', 'akhir')
+
+    def __init__(self, anak, awal, akhir):
+        self.anak = anak
+        self.awal = awal
+        self.akhir = akhir
+
+class SkemaKategori:
+    """Skema kategori tetap: memetakan metrik bertingkat ke vektor datar"""
+    __slots__ = ('kolom', 'akar')
+
+    def __init__(self, struktur):
+        self.kolom = []
+        self.akar = self._bangun(struktur, ())
+        self.kolom = tuple(self.kolom)
+
+    def _bangun(self, struktur, jalur):
+        awal = len(self.kolom)
+        anak = {}
+        for nama, isi in struktur.items():
+            if isinstance(isi, dict):
+                anak[nama] = self._bangun(isi, jalur + (nama,))
+            else:
+                awal_grup = len(self.kolom)
+                grup = {}
+                for label in isi:
+                    grup[label] = len(self.kolom)
+                    self.kolom.append('.'.join(jalur + (nama, label)))
+                anak[nama] = _Simpul(grup, awal_grup, len(self.kolom))
+        return _Simpul(anak, awal, len(self.kolom))
+
+    def __len__(self):
+        return len(self.kolom)
+
+    def ratakan(self, metrics, out=None):
+        # Isi vektor datar sesuai urutan kolom skema
+        if out is None:
+            out = np.empty(len(self.kolom), dtype=np.float64)
+        def isi(simpul, data):
+            for nama, sub in simpul.anak.items():
+                if isinstance(sub, _Simpul):
+                    isi(sub, data[nama])
+                else:
+                    out[sub] = data[nama]
+        isi(self.akar, metrics)
+        return out
+
+    def dari_dict(self, metrics):
+        return HasilSkor(self, self.ratakan(metrics))
+
+class _GrupSkor(Mapping):
+    __slots__ = ('_simpul', '_nilai')
+
+    def __init__(self, simpul, nilai):
+        self._simpul = simpul
+        self._nilai = nilai
+
+    def __getitem__(self, kunci):
+        sub = self._simpul.anak[kunci]
+        if isinstance(sub, _Simpul):
+            return _GrupSkor(sub, self._nilai)
+        return float(self._nilai[sub])
+
+    def __iter__(self):
+        return iter(self._simpul.anak)
+
+    def __len__(self):
+        return len(self._simpul.anak)
+
+    def larik(self):
+        # View NumPy (tanpa salinan) dari seluruh skor di bawah grup ini
+        return self._nilai[self._simpul.awal:self._simpul.akhir]
+
+    def ke_dict(self):
+        return {
+            k: v.ke_dict() if isinstance(v, _GrupSkor) else v
+            for k, v in self.items()
+        }
+
+class HasilSkor(_GrupSkor):
+    """Hasil analisis ringkas: satu vektor float64 dengan skema tetap"""
+    __slots__ = ('skema',)
+
+    def __init__(self, skema, nilai):
+        super().__init__(skema.akar, nilai)
+        self.skema = skema
+
+class ProfilMedis:
+    """Rekaman ringkas hasil SindromDownAnalyzer.analyze_medical_profile"""
+    __slots__ = (
+        'chromosome_abnormality', 'genetic_variation', 'physical_features_count',
+        'developmental_markers', 'associated_conditions',
+        'intervention_strategies', 'quality_of_life_indicators'
+    )
+    dtypes = dict(zip(__slots__, ['?', '?', 'i1', 'i1', 'i1', 'i1', 'i1']))
+
+    def __init__(self, **nilai):
+        for nama in self.__slots__:
+            setattr(self, nama, nilai[nama])
+
+    def __getitem__(self, nama):
+        return getattr(self, nama)
+
+    def keys(self):
+        return list(self.__slots__)
+
+    def values(self):
+        return [getattr(self, nama) for nama in self.__slots__]
+
+    def items(self):
+        return list(zip(self.__slots__, self.values()))
+
+class KohortHasil:
+    """Penyimpanan kolumnar hasil banyak pasien (satu larik NumPy per kolom)"""
+
+    def __init__(self, dtypes, kapasitas=1024):
+        self.dtypes = dict(dtypes)
+        self.n = 0
+        self._kolom = {
+            nama: np.empty(kapasitas, dtype=dtype) for nama, dtype in self.dtypes.items()
+        }
+
+    @classmethod
+    def untuk_skema(cls, skema, kapasitas=1024, dtype=np.float64):
+        return cls({nama: dtype for nama in skema.kolom}, kapasitas)
+
+    @classmethod
+    def untuk_profil_medis(cls, kapasitas=1024):
+        return cls(ProfilMedis.dtypes, kapasitas)
+
+    def __len__(self):
+        return self.n
+
+    def _pastikan_kapasitas(self, tambahan):
+        kapasitas = len(next(iter(self._kolom.values())))
+        if self.n + tambahan <= kapasitas:
+            return
+        kapasitas_baru = max(kapasitas * 2, self.n + tambahan)
+        for nama, lama in self._kolom.items():
+            baru = np.empty(kapasitas_baru, dtype=lama.dtype)
+            baru[:self.n] = lama[:self.n]
+            self._kolom[nama] = baru
+
+    def tambah(self, hasil):
+        self._pastikan_kapasitas(1)
+        if isinstance(hasil, HasilSkor):
+            for nama, nilai in zip(hasil.skema.kolom, hasil._nilai):
+                self._kolom[nama][self.n] = nilai
+        else:
+            for nama in self.dtypes:
+                self._kolom[nama][self.n] = hasil[nama]
+        self.n += 1
+
+    def tambah_batch(self, matriks):
+        # matriks: (n_pasien, n_kolom) dengan urutan kolom sama seperti dtypes
+        matriks = np.asarray(matriks)
+        self._pastikan_kapasitas(len(matriks))
+        for j, nama in enumerate(self.dtypes):
+            self._kolom[nama][self.n:self.n + len(matriks)] = matriks[:, j]
+        self.n += len(matriks)
+
+    def kolom(self, nama):
+        return self._kolom[nama][:self.n]
+
+    def matriks(self):
+        # (n_pasien, n_kolom) berurutan kolom (Fortran) agar reduksi per kolom tetap kontigu
+        return np.stack([self.kolom(nama) for nama in self.dtypes]).T
+
+    def ke_pandas(self):
+        # Setiap kolom dibungkus sebagai view, tanpa menyalin data
+        return pd.DataFrame({nama: self.kolom(nama) for nama in self.dtypes}, copy=False)
+
+    def ke_arrow(self):
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("Ekspor Arrow membutuhkan paket pyarrow") from e
+        return pa.table({nama: pa.array(self.kolom(nama)) for nama in self.dtypes})
+
+# Kamus istilah untuk analisis profil medis
+import os
+
+POLA_GENETIK = {
+    'chromosome_abnormality': re.compile(r'trisomy\s+21|chromosome\s+21'),
+    'genetic_variation': re.compile(r'mosaic|translocation')
+}
+
+ISTILAH_MEDIS = {
+    # 2. Karakteristik Fisik
+    'physical_features_count': [
+        'epicanthal fold', 'flat facial profile', 'small ears', 
+        'low muscle tone', 'short stature', 'single palmar crease'
+    ],
+    # 3. Perkembangan dan Neurologis
+    'developmental_markers': [
+        'intellectual disability', 'developmental delay', 
+        'cognitive impairment', 'speech delay'
+    ],
+    # 4. Kondisi Medis Terkait
+    'associated_conditions': [
+        'heart defect', 'congenital heart disease', 'thyroid', 
+        'hearing loss', 'vision problems', 'respiratory issues'
+    ],
+    # 5. Intervensi dan Manajemen
+    'intervention_strategies': [
+        'early intervention', 'therapy', 'support', 
+        'educational support', 'occupational therapy'
+    ],
+    # 6. Kualitas Hidup
+    'quality_of_life_indicators': [
+        'social skills', 'independence', 'inclusion', 
+        'life expectancy', 'quality of life'
+    ]
+}
+
+class PemindaiTeksMedis:
+    """Pemindai istilah medis yang dapat diberi teks sepotong demi sepotong"""
+
+    # Spasi beruntun (>= 2) tidak pernah menjadi bagian dari istilah literal,
+    # sehingga aman diringkas agar sambungan antar-potongan tetap terbatas
+    _SPASI_PANJANG = re.compile(r'\s{2,}')
+    _OVERLAP = max(len(i) for daftar in ISTILAH_MEDIS.values() for i in daftar) + len('chromosome\n\n21')
+
+    def __init__(self):
+        self.pola_ditemukan = set()
+        self.istilah_ditemukan = set()
+        self._ekor = ''
+        self._sisa_istilah = sum(len(daftar) for daftar in ISTILAH_MEDIS.values())
+
+    @property
+    def selesai(self):
+        return len(self.pola_ditemukan) == len(POLA_GENETIK) and self._sisa_istilah == 0
+
+    def pindai(self, teks):
+        # teks sudah dalam huruf kecil
+        for nama, pola in POLA_GENETIK.items():
+            if nama not in self.pola_ditemukan and pola.search(teks):
+                self.pola_ditemukan.add(nama)
+        for daftar in ISTILAH_MEDIS.values():
+            for istilah in daftar:
+                if istilah not in self.istilah_ditemukan and istilah in teks:
+                    self.istilah_ditemukan.add(istilah)
+                    self._sisa_istilah -= 1
+
+    def pindai_potongan(self, potongan):
+        # Sambungkan dengan ekor potongan sebelumnya agar istilah yang
+        # terpotong di perbatasan tetap terdeteksi
+        teks = self._SPASI_PANJANG.sub('\n\n', self._ekor + potongan.lower())
+        self.pindai(teks)
+        self._ekor = teks[-self._OVERLAP:]
+
+    def metrik(self):
+        metrics = {nama: nama in self.pola_ditemukan for nama in POLA_GENETIK}
+        for nama, daftar in ISTILAH_MEDIS.items():
+            metrics[nama] = sum(1 for istilah in daftar if istilah in self.istilah_ditemukan)
+        return ProfilMedis(**metrics)
+
+# Serialisasi ringkas figur Plotly untuk dikirim ke browser
+import base64 as _b64
+import functools
+import hashlib
+import json
+import time
+import plotly.io as pio
+import streamlit.components.v1 as components
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DIREKTORI_STATIS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# Template yang dipakai figur aplikasi; asetnya ditulis sekali saat start
+TEMPLATE_GRAFIK = (None, 'plotly_dark')
+
+_ESCAPE_SKRIP = str.maketrans({'<': '\\u003c', '>': '\\u003e', '/': '\\u002f'})
+
+class SerialisasiFigur:
+    """Kemas figur Plotly: larik biner bertipe, presisi terbatas, template bersama"""
+
+    def __init__(self, presisi=4, min_panjang_biner=16):
+        self.presisi = presisi
+        self.min_panjang_biner = min_panjang_biner
+        self.template = {}
+
+    def enkode(self, obj):
+        if orjson is not None:
+            teks = orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+        else:
+            teks = json.dumps(obj, separators=(',', ':'), default=lambda o: o.tolist())
+        # Payload disisipkan ke <script>: label dari pengguna tidak boleh menutup
+        # tag (seperti to_json_plotly). Karakter ini hanya muncul di dalam string JSON
+        return teks.translate(_ESCAPE_SKRIP)
+
+    def _kemas_larik(self, nilai, biner):
+        larik = np.asarray(nilai)
+        if larik.dtype.kind in 'iu' and self._muat(larik, 2**31 - 1):
+            larik = larik.astype(np.int32)
+        else:
+            # Bilangan bulat di luar int32 (mis. timestamp epoch-ms) tetap eksak di float64
+            larik = np.round(larik.astype(np.float64), self.presisi)
+        if not biner or larik.size < self.min_panjang_biner:
+            return larik.tolist()
+        # float32 hanya jika nilai terbesar pada presisi ini muat di mantisa 24 bit
+        if larik.dtype.kind == 'f' and self._muat(larik * 10.0 ** self.presisi, 2**24):
+            larik = larik.astype(np.float32)
+        spec = {'dtype': larik.dtype.str[1:], 'bdata': _b64.b64encode(larik.tobytes()).decode('ascii')}
+        if larik.ndim > 1:
+            spec['shape'] = ', '.join(str(n) for n in larik.shape)
+        return spec
+
+    def _muat(self, larik, batas):
+        terhingga = np.abs(larik[np.isfinite(larik)])
+        return terhingga.size == 0 or terhingga.max() <= batas
+
+    def _numerik(self, obj):
+        if isinstance(obj, np.ndarray):
+            return obj.dtype.kind in 'iuf'
+        return len(obj) > 0 and all(
+            isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, bool)
+            for v in obj
+        )
+
+    def _kemas(self, obj, biner):
+        if isinstance(obj, dict) and 'bdata' in obj and 'dtype' in obj:
+            # Larik yang sudah dikemas Plotly (float64 penuh) dikemas ulang
+            larik = np.frombuffer(_b64.b64decode(obj['bdata']), dtype=obj['dtype'])
+            if 'shape' in obj:
+                larik = larik.reshape([int(n) for n in str(obj['shape']).split(',')])
+            return self._kemas_larik(larik, biner)
+        if isinstance(obj, dict):
+            return {k: self._kemas(v, biner) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple, np.ndarray)):
+            if self._numerik(obj):
+                return self._kemas_larik(obj, biner)
+            return [self._kemas(v, biner) for v in obj]
+        if isinstance(obj, (float, np.floating)):
+            return round(float(obj), self.presisi)
+        return obj
+
+    def kemas(self, fig):
+        # Larik biner hanya untuk atribut data trace; layout cukup dibulatkan
+        spec = fig.to_plotly_json()
+        layout = dict(spec.get('layout', {}))
+        kunci_template = None
+        if 'template' in layout:
+            kunci_template = self.kunci_template(layout.pop('template'))
+        return {
+            'data': [self._kemas(trace, biner=True) for trace in spec.get('data', [])],
+            'layout': self._kemas(layout, biner=False),
+            'template': kunci_template
+        }
+
+    def serialisasi(self, fig):
+        mulai = time.perf_counter()
+        paket = self.kemas(fig)
+        payload = self.enkode(paket)
+        statistik = {
+            'template': paket['template'],
+            'byte_payload': len(payload.encode('utf-8')),
+            'ms_enkode': (time.perf_counter() - mulai) * 1000
+        }
+        return payload, statistik
+
+    def kunci_template(self, template):
+        teks_template = self.enkode(pio.json.to_json_plotly(template))
+        kunci = hashlib.sha1(teks_template.encode('utf-8')).hexdigest()[:12]
+        self.template.setdefault(kunci, teks_template)
+        return kunci
+
+    def skrip_template(self, kunci):
+        return f'window.PLOTLY_TEMPLATE = JSON.parse({self.template[kunci]});'
+
+def _tulis_aset(path, isi):
+    # Tulis atomik: proses lain tidak pernah membaca berkas setengah jadi
+    if os.path.exists(path):
+        return
+    sementara = f'{path}.{os.getpid()}.tmp'
+    with open(sementara, 'w', encoding='utf-8') as berkas:
+        berkas.write(isi())
+    os.replace(sementara, path)
+
+@st.cache_resource
+def aset_grafik(direktori=DIREKTORI_STATIS):
+    """plotly.js bawaan paket plotly dan template bersama sebagai aset statis
+
+    Ditulis sekali per proses; None jika direktori tidak dapat ditulis (mis.
+    deployment read-only), grafik lalu ditampilkan lewat st.plotly_chart.
+    """
+    serializer = SerialisasiFigur()
+    nama_js = f'plotly-{get_plotlyjs_version()}.min.js'
+    berkas = {nama_js: get_plotlyjs}
+    template = {}
+    for nama in TEMPLATE_GRAFIK:
+        fig = go.Figure() if nama is None else go.Figure().update_layout(template=nama)
+        kunci = serializer.kunci_template(fig.to_plotly_json()['layout']['template'])
+        berkas[f'plotly_template_{kunci}.js'] = functools.partial(serializer.skrip_template, kunci)
+        template[kunci] = f'app/static/plotly_template_{kunci}.js'
+    try:
+        os.makedirs(direktori, exist_ok=True)
+        for nama_berkas, isi in berkas.items():
+            _tulis_aset(os.path.join(direktori, nama_berkas), isi)
+        byte_plotly_js = os.path.getsize(os.path.join(direktori, nama_js))
+    except OSError:
+        return None
+    return {'plotly_js': f'app/static/{nama_js}', 'byte_plotly_js': byte_plotly_js, 'template': template}
+
+@st.cache_resource
+def serialisasi_figur(presisi):
+    return SerialisasiFigur(presisi=presisi)
+
+def tampilkan_grafik(fig, tinggi=450):
+    aset = aset_grafik()
+    if aset is None or not st.session_state.get('grafik_ringkas', True):
+        st.plotly_chart(fig, use_container_width=True)
+        return
+    serializer = serialisasi_figur(st.session_state.get('presisi_grafik', 4))
+    payload, statistik = serializer.serialisasi(fig)
+    kunci = statistik['template']
+    if kunci in aset['template']:
+        skrip_template = f'<script src="{aset["template"][kunci]}"></script>'
+    elif kunci:
+        # Template di luar TEMPLATE_GRAFIK disisipkan langsung, tanpa menulis berkas
+        skrip_template = f'<script>{serializer.skrip_template(kunci)}</script>'
+        statistik['byte_payload'] += len(serializer.template[kunci].encode('utf-8'))
+    else:
+        skrip_template = ''
+    html = f"""
+        <script src="{aset['plotly_js']}"></script>
+        {skrip_template}
+        <div id="grafik" style="width:100%;height:{tinggi - 20}px"></div>
+        <script>
+        const fig = {payload};
+        if (fig.template && window.PLOTLY_TEMPLATE) fig.layout.template = window.PLOTLY_TEMPLATE;
+        fig.layout.autosize = true;
+        Plotly.newPlot('grafik', fig.data, fig.layout, {{responsive: true}});
+        </script>
+    """
+    # st.iframe menggantikan components.html pada Streamlit versi baru
+    if hasattr(st, 'iframe'):
+        st.iframe(html, height=tinggi)
+    else:
+        components.html(html, height=tinggi)
+    st.caption(
+        f"Payload grafik: {statistik['byte_payload']:,} byte, "
+        f"enkode {statistik['ms_enkode']:.2f} ms "
+        f"(+ plotly.js {aset['byte_plotly_js'] / 1e6:.1f} MB, aset lokal yang di-cache browser)"
+    )
+
+# Pengaturan tampilan grafik (aset statis disiapkan pada run pertama proses)
+if aset_grafik() is None:
+    st.sidebar.caption('Grafik ringkas nonaktif: direktori static tidak dapat ditulis')
+st.sidebar.toggle('Grafik ringkas (payload biner)', value=True, key='grafik_ringkas')
+if st.session_state.get('grafik_ringkas', True):
+    st.sidebar.slider('Presisi desimal grafik', 2, 8, 4, key='presisi_grafik')
+
+# Memori per sesi: anggaran byte, akuntansi objek dan penggusuran LRU
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from plotly.basedatatypes import BaseFigure
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+ANGGARAN_SESI_MB = float(os.environ.get('SD_ANGGARAN_SESI_MB', 64))
+BATAS_DIAM_DETIK = float(os.environ.get('SD_BATAS_DIAM_DETIK', 30 * 60))
+# Tabel semua sesi hanya untuk admin; pengguna biasa melihat sesinya sendiri
+DIAGNOSTIK_ADMIN = os.environ.get('SD_DIAGNOSTIK_ADMIN', '') == '1'
+
+def ukuran_objek(obj, _dilihat=None):
+    """Perkiraan byte yang ditahan obj (larik, DataFrame, figur, analyzer)"""
+    if _dilihat is None:
+        _dilihat = set()
+    if id(obj) in _dilihat:
+        return 0
+    _dilihat.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + sys.getsizeof(np.empty(0))
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return int(np.sum(obj.memory_usage(deep=True)))
+    if isinstance(obj, BaseFigure):
+        return ukuran_objek(obj.to_plotly_json(), _dilihat)
+    ukuran = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return ukuran
+    if isinstance(obj, Mapping):
+        ukuran += sum(ukuran_objek(k, _dilihat) + ukuran_objek(v, _dilihat) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        ukuran += sum(ukuran_objek(v, _dilihat) for v in obj)
+    # Mapping kustom (HasilSkor) juga menahan data lewat atribut/slot
+    if hasattr(obj, '__dict__'):
+        ukuran += ukuran_objek(vars(obj), _dilihat)
+    # __slots__ kelas induk ikut dihitung (mis. _nilai milik _GrupSkor pada HasilSkor)
+    for kelas in type(obj).__mro__:
+        slots = kelas.__dict__.get('__slots__', ())
+        for slot in (slots,) if isinstance(slots, str) else slots:
+            ukuran += ukuran_objek(getattr(obj, slot, None), _dilihat)
+    return ukuran
+
+class PenyimpananSesi:
+    """Hasil analisis satu sesi; entri lama digusur (LRU) saat melampaui anggaran"""
+
+    def __init__(self, anggaran_byte):
+        self.anggaran_byte = anggaran_byte
+        self.terakhir_aktif = time.time()
+        self.statistik = {'hit': 0, 'miss': 0, 'hitung_ulang': 0, 'gusur': 0}
+        self._entri = OrderedDict()
+        self._tergusur = OrderedDict()
+        self._kunci = threading.Lock()
+
+    def __len__(self):
+        return len(self._entri)
+
+    @property
+    def byte(self):
+        with self._kunci:
+            return sum(b for _, b in self._entri.values())
+
+    def ambil(self, kunci, hitung):
+        # Entri yang sudah digusur dihitung ulang secara transparan lewat hitung()
+        with self._kunci:
+            self.terakhir_aktif = time.time()
+            if kunci in self._entri:
+                self._entri.move_to_end(kunci)
+                self.statistik['hit'] += 1
+                return self._entri[kunci][0]
+        nilai = hitung()
+        byte = ukuran_objek(nilai)
+        with self._kunci:
+            self.statistik['hitung_ulang' if self._tergusur.pop(kunci, False) else 'miss'] += 1
+            self._entri[kunci] = (nilai, byte)
+            self._entri.move_to_end(kunci)
+            # Entri terbaru tetap disimpan meskipun sendirian melampaui anggaran
+            total = sum(b for _, b in self._entri.values())
+            while total > self.anggaran_byte and len(self._entri) > 1:
+                lama, (_, byte_lama) = self._entri.popitem(last=False)
+                total -= byte_lama
+                self._catat_gusur(lama)
+        return nilai
+
+    def _catat_gusur(self, kunci):
+        self.statistik['gusur'] += 1
+        self._tergusur[kunci] = True
+        while len(self._tergusur) > 1024:
+            self._tergusur.popitem(last=False)
+
+    def kosongkan(self):
+        with self._kunci:
+            for kunci in list(self._entri):
+                self._catat_gusur(kunci)
+            self._entri.clear()
+
+    def rincian(self):
+        with self._kunci:
+            return [(kunci, byte) for kunci, (_, byte) in reversed(self._entri.items())]
+
+class RegistriSesi:
+    """Semua penyimpanan sesi dalam proses; sesi diam dikosongkan berkala"""
+
+    def __init__(self, anggaran_byte, batas_diam_detik):
+        self.anggaran_byte = anggaran_byte
+        self.batas_diam_detik = batas_diam_detik
+        # Referensi lemah: penyimpanan ikut lenyap saat session_state sesi dibuang
+        self._sesi = weakref.WeakValueDictionary()
+        self._kunci = threading.Lock()
+        self._penjadwal = None
+
+    def daftar(self, id_sesi):
+        with self._kunci:
+            penyimpanan = self._sesi.get(id_sesi)
+            if penyimpanan is None:
+                penyimpanan = PenyimpananSesi(self.anggaran_byte)
+                self._sesi[id_sesi] = penyimpanan
+            return penyimpanan
+
+    def gusur_diam(self):
+        batas = time.time() - self.batas_diam_detik
+        with self._kunci:
+            semua = list(self._sesi.values())
+        diam = [p for p in semua if p.terakhir_aktif < batas and len(p)]
+        for penyimpanan in diam:
+            penyimpanan.kosongkan()
+        return len(diam)
+
+    def jadwalkan(self, interval_detik=60):
+        def siklus():
+            self.gusur_diam()
+            self._penjadwal = threading.Timer(interval_detik, siklus)
+            self._penjadwal.daemon = True
+            self._penjadwal.start()
+        if self._penjadwal is None:
+            siklus()
+
+    def diagnostik(self, id_sesi_aktif=None, semua_sesi=False):
+        with self._kunci:
+            semua = [(i, p) for i, p in self._sesi.items() if semua_sesi or i == id_sesi_aktif]
+        sekarang = time.time()
+        return pd.DataFrame([
+            {
+                'sesi': id_sesi[:8] + (' (ini)' if id_sesi == id_sesi_aktif else ''),
+                'entri': len(p),
+                'memori_mb': p.byte / 2**20,
+                'anggaran_mb': p.anggaran_byte / 2**20,
+                'diam_detik': sekarang - p.terakhir_aktif,
+                **p.statistik
+            }
+            for id_sesi, p in semua
+        ], columns=[
+            'sesi', 'entri', 'memori_mb', 'anggaran_mb', 'diam_detik', 'hit', 'miss', 'hitung_ulang', 'gusur'
+        ])
+
+@st.cache_resource
+def registri_sesi(anggaran_mb=ANGGARAN_SESI_MB, batas_diam_detik=BATAS_DIAM_DETIK):
+    registri = RegistriSesi(int(anggaran_mb * 2**20), batas_diam_detik)
+    registri.jadwalkan()
+    return registri
+
+def id_sesi():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else 'lokal'
+
+def penyimpanan_sesi():
+    # Objek disimpan di session_state (referensi kuat); registri hanya mengamati
+    if 'penyimpanan_sesi' not in st.session_state:
+        st.session_state['penyimpanan_sesi'] = registri_sesi().daftar(id_sesi())
+    return st.session_state['penyimpanan_sesi']
+
+def kunci_teks(teks):
+    return hashlib.sha1(teks.encode('utf-8')).hexdigest()
+
 class SindromDownAnalyzer:
     def __init__(self, medical_text):
         self.text = medical_text
-        self.sentences = medical_text.split('.')
-        self.words = medical_text.split()
+
+    @property
+    def sentences(self):
+        return self.text.split('.')
+
+    @property
+    def words(self):
+        return self.text.split()
+
+    @staticmethod
+    def analyze_file(sumber, ukuran_potongan=1 << 20, encoding='utf-8'):
+        # Mode streaming: memori konstan berapapun ukuran file catatan
+        pemindai = PemindaiTeksMedis()
+        if isinstance(sumber, (str, os.PathLike)):
+            berkas = open(sumber, encoding=encoding, errors='replace')
+        else:
+            berkas = sumber
+        try:
+            while not pemindai.selesai:
+                potongan = berkas.read(ukuran_potongan)
+                if not potongan:
+                    break
+                pemindai.pindai_potongan(potongan)
+        finally:
+            if berkas is not sumber:
+                berkas.close()
+        return pemindai.metrik()
     
     def analyze_medical_profile(self):
-        metrics = {}
-        
-        # 1. Karakteristik Genetik
-        metrics['chromosome_abnormality'] = len(re.findall(r'trisomy\s+21|chromosome\s+21', self.text.lower())) > 0
-        metrics['genetic_variation'] = len(re.findall(r'mosaic|translocation', self.text.lower())) > 0
-        
-        # 2. Karakteristik Fisik
-        physical_features = [
-            'epicanthal fold', 'flat facial profile', 'small ears', 
-            'low muscle tone', 'short stature', 'single palmar crease'
-        ]
-        metrics['physical_features_count'] = sum(1 for feature in physical_features if feature in self.text.lower())
-        
-        # 3. Perkembangan dan Neurologis
-        dev_markers = [
-            'intellectual disability', 'developmental delay', 
-            'cognitive impairment', 'speech delay'
-        ]
-        metrics['developmental_markers'] = sum(1 for marker in dev_markers if marker in self.text.lower())
-        
-        # 4. Kondisi Medis Terkait
-        medical_conditions = [
-            'heart defect', 'congenital heart disease', 'thyroid', 
-            'hearing loss', 'vision problems', 'respiratory issues'
-        ]
-        metrics['associated_conditions'] = sum(1 for condition in medical_conditions if condition in self.text.lower())
-        
-        # 5. Intervensi dan Manajemen
-        intervention_markers = [
-            'early intervention', 'therapy', 'support', 
-            'educational support', 'occupational therapy'
-        ]
-        metrics['intervention_strategies'] = sum(1 for marker in intervention_markers if marker in self.text.lower())
-        
-        # 6. Kualitas Hidup
-        quality_of_life_markers = [
-            'social skills', 'independence', 'inclusion', 
-            'life expectancy', 'quality of life'
-        ]
-        metrics['quality_of_life_indicators'] = sum(1 for marker in quality_of_life_markers if marker in self.text.lower())
-        
-        return metrics
+        pemindai = PemindaiTeksMedis()
+        pemindai.pindai(self.text.lower())
+        return pemindai.metrik()
+    
+    def analyze_text_statistics(self):
+        return statistik_teks(self.text)
     
     def create_visualizations(self):
         metrics = self.analyze_medical_profile()
@@ -136,11 +761,225 @@ class SindromDownAnalyzer:
         
         return figs, metrics
 
+# Statistik teks: entropi distribusi kata, kepadatan leksikal dan sentimen
+POLA_TOKEN = re.compile(r'[^\W\d_]+')
+
+KATA_FUNGSI = frozenset("""
+dan atau yang di ke dari untuk dengan pada dalam ini itu adalah telah sudah akan
+juga tidak tetapi karena sebagai oleh serta seperti bagi sejak hingga saat ada
+the a an and or of to in on at for with by from as is are was were be been has
+have had this that these those it its but not no which who
+""".split())
+
+def tokenisasi(teks):
+    return POLA_TOKEN.findall(teks.lower())
+
+class StatistikTeksKorpus:
+    """Statistik teks per catatan untuk korpus besar dengan kosakata bersama
+
+    sentimen_leksikon adalah rata-rata polaritas kata beropini (leksikon TextBlob
+    per kata, tanpa negasi dan penguat), berbeda dari sentimen statistik_teks
+    yang memakai TextBlob pada kalimat utuh.
+    """
+
+    def __init__(self):
+        self.kosakata = {}
+        self._kata_isi = np.zeros(0, dtype=bool)
+        self._polaritas = np.zeros(0, dtype=np.float64)
+
+    def _perbarui_leksikon(self):
+        # Sifat kata dihitung sekali per entri kosakata, bukan per kemunculan
+        kata_baru = list(self.kosakata)[len(self._kata_isi):]
+        if not kata_baru:
+            return
+        self._kata_isi = np.concatenate([
+            self._kata_isi, [kata not in KATA_FUNGSI for kata in kata_baru]
+        ])
+        self._polaritas = np.concatenate([
+            self._polaritas, [TextBlob(kata).sentiment.polarity for kata in kata_baru]
+        ])
+
+    def hitung_batch(self, daftar_teks):
+        kosakata = self.kosakata
+        daftar_id = [
+            np.fromiter(
+                (kosakata.setdefault(kata, len(kosakata)) for kata in tokenisasi(teks)),
+                dtype=np.int64
+            )
+            for teks in daftar_teks
+        ]
+        self._perbarui_leksikon()
+        
+        n = len(daftar_id)
+        panjang = np.array([len(ids) for ids in daftar_id], dtype=np.int64)
+        ids = np.concatenate(daftar_id) if n else np.zeros(0, dtype=np.int64)
+        dok = np.repeat(np.arange(n), panjang)
+        
+        # Frekuensi (catatan, kata) lewat kunci gabungan
+        kunci, frekuensi = np.unique(dok * len(kosakata) + ids, return_counts=True)
+        dok_kunci = kunci // max(len(kosakata), 1)
+        f_log_f = np.bincount(dok_kunci, weights=frekuensi * np.log(frekuensi), minlength=n)
+        
+        total = np.maximum(panjang, 1)
+        polaritas = self._polaritas[ids]
+        jumlah_opini = np.bincount(dok, weights=polaritas != 0, minlength=n)
+        
+        return pd.DataFrame({
+            'entropi': np.where(panjang > 0, np.log(total) - f_log_f / total, 0.0),
+            'kepadatan_leksikal': np.bincount(dok, weights=self._kata_isi[ids], minlength=n) / total,
+            'sentimen_leksikon': np.bincount(dok, weights=polaritas, minlength=n) / np.maximum(jumlah_opini, 1),
+            'jumlah_kata': panjang
+        }, copy=False)
+
+    def hitung_korpus(self, daftar_teks, ukuran_batch=10000):
+        hasil = [
+            self.hitung_batch(daftar_teks[i:i + ukuran_batch])
+            for i in range(0, len(daftar_teks), ukuran_batch)
+        ]
+        return pd.concat(hasil, ignore_index=True) if hasil else self.hitung_batch([])
+
+def statistik_teks(teks):
+    token = tokenisasi(teks)
+    if not token:
+        return {'entropi': 0.0, 'kepadatan_leksikal': 0.0, 'sentimen': 0.0, 'jumlah_kata': 0}
+    _, frekuensi = np.unique(token, return_counts=True)
+    return {
+        'entropi': float(entropy(frekuensi)),
+        'kepadatan_leksikal': sum(1 for kata in token if kata not in KATA_FUNGSI) / len(token),
+        'sentimen': TextBlob(teks).sentiment.polarity,
+        'jumlah_kata': len(token)
+    }
+
+# Pencarian kasus serupa: fitur sparse + indeks tetangga terdekat
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+KOLOM_LEKSIKON = list(POLA_GENETIK) + [istilah for daftar in ISTILAH_MEDIS.values() for istilah in daftar]
+
+class IndeksKemiripanPasien:
+    """Indeks kemiripan catatan pasien (kosinus) dengan penambahan inkremental"""
+
+    def __init__(self, n_fitur=2 ** 18, bobot_leksikon=2.0, batas_penyangga=4096, maks_df=0.1, min_pangkas=1000):
+        self.n_fitur = n_fitur
+        self.bobot_leksikon = bobot_leksikon
+        self.batas_penyangga = batas_penyangga
+        # Fitur kueri yang muncul di lebih dari maks_df bagian catatan (kata dan
+        # bigram umum) dilewati setelah indeks berisi min_pangkas catatan:
+        # daftar postingnya terpanjang tetapi hampir tidak membedakan catatan
+        self.maks_df = maks_df
+        self.min_pangkas = min_pangkas
+        self.id_pasien = []
+        self._hasher = HashingVectorizer(
+            n_features=n_fitur, ngram_range=(1, 2), alternate_sign=False, norm=None
+        )
+        # Matriks utama disimpan CSC: kolom = fitur, sehingga kueri hanya
+        # menyentuh daftar posting fitur yang muncul di catatan kueri
+        self._utama = sparse.csc_matrix((0, n_fitur + len(KOLOM_LEKSIKON)))
+        self._penyangga = []
+        self._frekuensi_dok = None
+
+    def __len__(self):
+        return len(self.id_pasien)
+
+    def fitur(self, daftar_teks):
+        baris, kolom = [], []
+        for i, teks in enumerate(daftar_teks):
+            pemindai = PemindaiTeksMedis()
+            pemindai.pindai(teks.lower())
+            for j, nama in enumerate(KOLOM_LEKSIKON):
+                if nama in pemindai.pola_ditemukan or nama in pemindai.istilah_ditemukan:
+                    baris.append(i)
+                    kolom.append(j)
+        leksikon = sparse.csr_matrix(
+            (np.full(len(baris), self.bobot_leksikon), (baris, kolom)),
+            shape=(len(daftar_teks), len(KOLOM_LEKSIKON))
+        )
+        ngram = self._hasher.transform(daftar_teks)
+        return normalize(sparse.hstack([ngram, leksikon], format='csr'))
+
+    def tambah(self, id_pasien, daftar_teks):
+        self._penyangga.append(self.fitur(daftar_teks))
+        self.id_pasien.extend(id_pasien)
+        if sum(m.shape[0] for m in self._penyangga) >= self.batas_penyangga:
+            self._gabung()
+
+    def _gabung(self):
+        if self._penyangga:
+            self._utama = sparse.vstack([self._utama] + self._penyangga, format='csc')
+            self._penyangga = []
+            self._frekuensi_dok = None
+
+    def frekuensi_dok(self):
+        # Jumlah catatan per fitur = panjang daftar posting CSC
+        if self._frekuensi_dok is None:
+            self._frekuensi_dok = np.diff(self._utama.indptr)
+        return self._frekuensi_dok
+
+    def cari(self, teks, k=5):
+        q = self.fitur([teks])
+        kolom, bobot = q.indices, q.data
+        n = self._utama.shape[0]
+        if n >= self.min_pangkas:
+            pakai = self.frekuensi_dok()[kolom] <= self.maks_df * n
+            kolom, bobot = kolom[pakai], bobot[pakai]
+        # Gabungkan daftar posting langsung dari indptr/indices tanpa menyalin
+        # submatriks kolom
+        m = self._utama
+        awal = m.indptr[kolom]
+        panjang = m.indptr[kolom + 1] - awal
+        posisi = np.repeat(awal - np.cumsum(panjang) + panjang, panjang) + np.arange(panjang.sum())
+        skor = np.bincount(
+            m.indices[posisi], weights=np.repeat(bobot, panjang) * m.data[posisi], minlength=n
+        )
+        if self._penyangga:
+            vektor = np.zeros(q.shape[1])
+            vektor[kolom] = bobot
+            skor = np.concatenate([skor] + [penyangga @ vektor for penyangga in self._penyangga])
+        k = min(k, len(skor))
+        if k == 0:
+            return []
+        teratas = np.argpartition(-skor, k - 1)[:k]
+        teratas = teratas[np.argsort(-skor[teratas], kind='stable')]
+        return [(self.id_pasien[i], float(skor[i])) for i in teratas]
+
+    def simpan(self, path):
+        self._gabung()
+        m = self._utama
+        # Lewat handle berkas: np.savez tidak menambah akhiran .npz, jadi
+        # muat(path) membuka berkas yang sama
+        with open(path, 'wb') as berkas:
+            np.savez(
+                berkas, data=m.data, indices=m.indices, indptr=m.indptr, shape=m.shape,
+                id_pasien=np.array(self.id_pasien, dtype=str),
+                konfigurasi=np.array([
+                    self.n_fitur, self.bobot_leksikon, self.batas_penyangga, self.maks_df, self.min_pangkas
+                ])
+            )
+
+    @classmethod
+    def muat(cls, path):
+        with np.load(path) as berkas:
+            n_fitur, bobot, batas, *pangkas = berkas['konfigurasi']
+            indeks = cls(int(n_fitur), float(bobot), int(batas))
+            if pangkas:
+                indeks.maks_df, indeks.min_pangkas = float(pangkas[0]), int(pangkas[1])
+            indeks._utama = sparse.csc_matrix(
+                (berkas['data'], berkas['indices'], berkas['indptr']), shape=tuple(berkas['shape'])
+            )
+            indeks.id_pasien = berkas['id_pasien'].tolist()
+        return indeks
+
+@st.cache_resource
+def muat_indeks_kemiripan(path):
+    return IndeksKemiripanPasien.muat(path)
+
 # Aplikasi Utama Streamlit
 def main():
     st.title('Analisis Komprehensif Sindrom Down')
     
     st.sidebar.header('Konfigurasi Analisis')
+    path_indeks = st.sidebar.text_input('Indeks Kasus Serupa (.npz)', '')
     
     # Input teks medis
     medical_text = st.text_area(
@@ -156,10 +995,13 @@ def main():
     if st.button("Analisis Profil Medis", type="primary"):
         with st.spinner('Menganalisis informasi medis...'):
             # Buat instance analyzer
-            analyzer = SindromDownAnalyzer(medical_text)
+            def hitung():
+                analyzer = SindromDownAnalyzer(medical_text)
+                figs, metrics = analyzer.create_visualizations()
+                return figs, metrics, analyzer.analyze_text_statistics()
             
-            # Dapatkan visualisasi dan metrik
-            figs, metrics = analyzer.create_visualizations()
+            # Dapatkan visualisasi dan metrik (disimpan per sesi dalam anggaran memori)
+            figs, metrics, statistik = penyimpanan_sesi().ambil(('profil_medis', kunci_teks(medical_text)), hitung)
             
             # Tampilkan hasil
             st.header('Hasil Analisis')
@@ -168,13 +1010,13 @@ def main():
             tab1, tab2, tab3 = st.tabs(["Profil Radar", "Bar Chart", "Distribusi"])
             
             with tab1:
-                st.plotly_chart(figs[0], use_container_width=True)
+                tampilkan_grafik(figs[0])
             
             with tab2:
-                st.plotly_chart(figs[1], use_container_width=True)
+                tampilkan_grafik(figs[1])
             
             with tab3:
-                st.plotly_chart(figs[2], use_container_width=True)
+                tampilkan_grafik(figs[2])
             
             # Tampilkan metrik detail
             st.header('Detail Metrik')
@@ -184,6 +1026,10 @@ def main():
                 st.subheader('Karakteristik Utama')
                 for key, value in metrics.items():
                     st.metric(key.replace('_', ' ').title(), value)
+                
+                st.subheader('Statistik Teks')
+                for key, value in statistik.items():
+                    st.metric(key.replace('_', ' ').title(), round(value, 3))
             
             with col2:
                 st.subheader('Interpretasi')
@@ -192,6 +1038,14 @@ def main():
                 - Setiap metrik menunjukkan aspek penting dalam diagnosis dan manajemen
                 - Gunakan informasi ini sebagai panduan untuk intervensi dan dukungan
                 """)
+            
+            # Kasus serupa dari arsip
+            if path_indeks and os.path.exists(path_indeks):
+                st.header('Kasus Serupa')
+                indeks = muat_indeks_kemiripan(path_indeks)
+                st.dataframe(pd.DataFrame(
+                    indeks.cari(medical_text, k=5), columns=['ID Pasien', 'Kemiripan']
+                ))
 
 # Jalankan aplikasi
 if __name__ == "__main__":
@@ -214,9 +1068,109 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Model skor risiko kondisi medis
+import json
+
+PANEL_GEN = ('DYRK1A', 'SOD1', 'RCAN1', 'APP')
+KONDISI_RISIKO = ('Penyakit Jantung', 'Gangguan Tiroid', 'Leukemia', 'Demensia Dini')
+PATH_MODEL_RISIKO = os.environ.get('SD_MODEL_RISIKO', '')
+
+# Koefisien log-odds relatif terhadap pasien referensi: pasien dengan fitur
+# referensi mendapat tepat risiko_dasar, deviasi fitur menggeser log-odds.
+# Koefisien bawaan ini tidak dikalibrasi pada data pasien (ilustratif saja);
+# skor klinis memerlukan model terlatih lewat SD_MODEL_RISIKO
+MODEL_RISIKO_DEFAULT = {
+    'ilustratif': True,
+    'kondisi': list(KONDISI_RISIKO),
+    'risiko_dasar': [0.45, 0.35, 0.15, 0.25],
+    'fitur': list(ProfilMedis.__slots__) + list(PANEL_GEN),
+    'referensi': [1, 0, 2, 1, 1, 1, 0, 0.75, 0.65, 0.55, 0.45],
+    'bobot': [
+        [0.40, -0.50, 0.10, 0.00, 0.60, 0.00, -0.05, 0.80, 0.00, 0.80, 0.00],
+        [0.30, -0.30, 0.05, 0.00, 0.30, 0.00, -0.05, 0.00, 0.40, 0.00, 0.00],
+        [0.50, -0.40, 0.00, 0.00, 0.20, 0.00, 0.00, 0.60, 0.30, 0.00, 0.00],
+        [0.30, -0.40, 0.00, 0.35, 0.10, -0.10, -0.15, 1.00, 0.50, 0.30, 2.50]
+    ]
+}
+
+class ModelRisiko:
+    """Model logistik risiko kondisi medis, dievaluasi per batch pasien"""
+
+    def __init__(self, kondisi, risiko_dasar, fitur, referensi, bobot, ilustratif=False):
+        self.kondisi = list(kondisi)
+        self.fitur_nama = list(fitur)
+        self.referensi = np.asarray(referensi, dtype=np.float64)
+        self.bobot = np.asarray(bobot, dtype=np.float64)
+        self.ilustratif = bool(ilustratif)
+        p = np.asarray(risiko_dasar, dtype=np.float64)
+        if len(set(self.kondisi)) != len(self.kondisi) or set(self.kondisi) != set(KONDISI_RISIKO):
+            raise ValueError(f"Kondisi model harus tepat {KONDISI_RISIKO}, diperoleh {self.kondisi}")
+        hilang = [nama for nama in ProfilMedis.__slots__ if nama not in self.fitur_nama]
+        if hilang:
+            raise ValueError(f"Fitur model tidak memuat {hilang}")
+        if (
+            self.referensi.shape != (len(self.fitur_nama),)
+            or self.bobot.shape != (len(self.kondisi), len(self.fitur_nama))
+            or p.shape != (len(self.kondisi),)
+        ):
+            raise ValueError("Ukuran referensi, bobot atau risiko_dasar tidak sesuai kondisi x fitur")
+        self.intersep = np.log(p / (1 - p)) - self.bobot @ self.referensi
+
+    @classmethod
+    def dari_berkas(cls, path):
+        with open(path, encoding='utf-8') as berkas:
+            return cls(**json.load(berkas))
+
+    def fitur(self, profil=None, ekspresi=None):
+        # Fitur yang tidak tersedia diisi nilai referensi
+        x = self.referensi.copy()
+        if profil is not None:
+            for nama in ProfilMedis.__slots__:
+                x[self.fitur_nama.index(nama)] = profil[nama]
+        for gen, nilai in (ekspresi or {}).items():
+            if gen in self.fitur_nama:
+                x[self.fitur_nama.index(gen)] = nilai
+        return x
+
+    def prediksi(self, X):
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        return 1.0 / (1.0 + np.exp(-(X @ self.bobot.T + self.intersep)))
+
+    def prediksi_kohort(self, kohort_profil, ekspresi_panel):
+        # kohort_profil: KohortHasil.untuk_profil_medis, ekspresi_panel: (n, len(PANEL_GEN))
+        X = np.empty((len(kohort_profil), len(self.fitur_nama)))
+        for nama in ProfilMedis.__slots__:
+            X[:, self.fitur_nama.index(nama)] = kohort_profil.kolom(nama)
+        for j, gen in enumerate(PANEL_GEN):
+            X[:, self.fitur_nama.index(gen)] = ekspresi_panel[:, j]
+        return self.prediksi(X)
+
+@st.cache_resource
+def muat_model_risiko(path=PATH_MODEL_RISIKO):
+    if path:
+        return ModelRisiko.dari_berkas(path)
+    return ModelRisiko(**MODEL_RISIKO_DEFAULT)
+
+SKEMA_GENETIK = SkemaKategori({
+    'tipe_sindrom_down': ('Trisomy 21 Penuh', 'Mosaic', 'Translokasi'),
+    'marker_genetik': ('DYRK1A', 'SOD1', 'RCAN1', 'APP'),
+    'risiko_kondisi_medis': KONDISI_RISIKO,
+    'ekspresi_gen': ('Overekspresi', 'Underekspresi', 'Netral')
+})
+
 class SindromDownGenetikAnalyzer:
-    def __init__(self, genetic_data):
+    def __init__(self, genetic_data, model=None):
         self.data = genetic_data
+        self.model = model
+    
+    def model_risiko(self):
+        return self.model or muat_model_risiko()
+    
+    def skor_risiko(self, model=None):
+        model = model or self.model_risiko()
+        ekspresi = dict(zip(self.data.get('gen_utama', []), self.data.get('ekspresi', [])))
+        x = model.fitur(self.data.get('profil_medis'), ekspresi)
+        return dict(zip(model.kondisi, model.prediksi(x)[0].tolist()))
     
     def analisis_genetik_detail(self):
         # Simulasi analisis genetik komprehensif
@@ -237,12 +1191,7 @@ class SindromDownGenetikAnalyzer:
             },
             
             # Risiko Kondisi Medis
-            'risiko_kondisi_medis': {
-                'Penyakit Jantung': 0.45,
-                'Gangguan Tiroid': 0.35,
-                'Leukemia': 0.15,
-                'Demensia Dini': 0.25
-            },
+            'risiko_kondisi_medis': self.skor_risiko(),
             
             # Profil Ekspresi Gen
             'ekspresi_gen': {
@@ -251,15 +1200,15 @@ class SindromDownGenetikAnalyzer:
                 'Netral': 0.0
             }
         }
-        return metrics
+        return SKEMA_GENETIK.dari_dict(metrics)
     
     def visualisasi_genetik(self, metrics):
         figs = []
         
         # 1. Pie Chart Tipe Sindrom Down
         fig_tipe = go.Figure(data=[go.Pie(
-            labels=list(metrics['tipe_sindrom_down'].keys()),
-            values=list(metrics['tipe_sindrom_down'].values()),
+            labels=list(metrics['tipe_sindrom_down']),
+            values=metrics['tipe_sindrom_down'].larik(),
             hole=0.3,
             marker_colors=['#FF6384', '#36A2EB', '#FFCE56']
         )])
@@ -271,8 +1220,8 @@ class SindromDownGenetikAnalyzer:
         
         # 2. Bar Chart Marker Genetik
         fig_marker = go.Figure(data=[go.Bar(
-            x=list(metrics['marker_genetik'].keys()),
-            y=list(metrics['marker_genetik'].values()),
+            x=list(metrics['marker_genetik']),
+            y=metrics['marker_genetik'].larik(),
             marker_color='lightblue'
         )])
         fig_marker.update_layout(
@@ -284,10 +1233,9 @@ class SindromDownGenetikAnalyzer:
         figs.append(fig_marker)
         
         # 3. Heatmap Risiko Kondisi Medis
-        risiko_data = pd.DataFrame.from_dict(
-            metrics['risiko_kondisi_medis'], 
-            orient='index', 
-            columns=['Risiko']
+        risiko_data = pd.DataFrame(
+            {'Risiko': metrics['risiko_kondisi_medis'].larik()},
+            index=list(metrics['risiko_kondisi_medis'])
         )
         
         fig_heatmap = go.Figure(data=go.Heatmap(
@@ -297,15 +1245,15 @@ class SindromDownGenetikAnalyzer:
             colorscale='Viridis'
         ))
         fig_heatmap.update_layout(
-            title='Peta Risiko Kondisi Medis Terkait',
+            title='Peta Risiko Kondisi Medis Terkait' + (' (Ilustratif)' if self.model_risiko().ilustratif else ''),
             template='plotly_dark'
         )
         figs.append(fig_heatmap)
         
         # 4. Pie Chart Ekspresi Gen
         fig_ekspresi = go.Figure(data=[go.Pie(
-            labels=list(metrics['ekspresi_gen'].keys()),
-            values=list(metrics['ekspresi_gen'].values()),
+            labels=list(metrics['ekspresi_gen']),
+            values=metrics['ekspresi_gen'].larik(),
             hole=0.3,
             marker_colors=['#FF6384', '#36A2EB', '#FFCE56']
         )])
@@ -318,6 +1266,7 @@ class SindromDownGenetikAnalyzer:
         return figs, risiko_data
     
     def generate_laporan_genetik(self, metrics):
+        ilustratif = self.model_risiko().ilustratif
         laporan = """
         ## Laporan Analisis Genetik Sindrom Down
 
@@ -329,6 +1278,7 @@ class SindromDownGenetikAnalyzer:
         {marker_detail}
 
         ### Potensi Risiko Medis
+        {catatan_model}
         {risiko_detail}
 
         ### Rekomendasi Lanjutan
@@ -340,8 +1290,12 @@ class SindromDownGenetikAnalyzer:
                 f"- **{gen}**: Tingkat Ekspresi {nilai*100:.2f}%"
                 for gen, nilai in metrics['marker_genetik'].items()
             ]),
+            catatan_model=(
+                "*Skor ilustratif dari koefisien bawaan yang belum dikalibrasi, "
+                "bukan estimasi risiko pasien.*" if ilustratif else ""
+            ),
             risiko_detail="\n".join([
-                f"- **{kondisi}**: Risiko {nilai*100:.2f}%"
+                f"- **{kondisi}**: Risiko {'ilustratif ' if ilustratif else ''}{nilai*100:.2f}%"
                 for kondisi, nilai in metrics['risiko_kondisi_medis'].items()
             ])
         )
@@ -351,6 +1305,7 @@ def main():
     st.title('Analisis Genetik Sindrom Down Lanjutan')
     
     st.sidebar.header('Konfigurasi Analisis Genetik')
+    path_model = st.sidebar.text_input('Model Risiko Terkalibrasi (.json)', PATH_MODEL_RISIKO)
     
     # Contoh data genetik default
     default_genetic_data = {
@@ -368,6 +1323,9 @@ def main():
     with col2:
         ekspresi_input = st.text_input('Tingkat Ekspresi (0-1)', value='0.75, 0.65, 0.55, 0.45')
     
+    # Catatan medis mengisi fitur profil model risiko (tanpa catatan: nilai referensi)
+    catatan_medis = st.text_area('Catatan Medis Pasien (opsional)', '')
+    
     if st.button('Analisis Genetik Mendalam', type='primary'):
         with st.spinner('Menganalisis profil genetik...'):
             # Konversi input
@@ -376,14 +1334,25 @@ def main():
                 ekspresis = [float(e.strip()) for e in ekspresi_input.split(',')]
                 
                 # Inisialisasi analyzer
-                analyzer = SindromDownGenetikAnalyzer(
-                    {'gen_utama': gens, 'ekspresi': ekspresis}
-                )
+                data_genetik = {'gen_utama': gens, 'ekspresi': ekspresis}
+                if catatan_medis.strip():
+                    data_genetik['profil_medis'] = SindromDownAnalyzer(catatan_medis).analyze_medical_profile()
+                analyzer = SindromDownGenetikAnalyzer(data_genetik, model=muat_model_risiko(path_model))
+                if analyzer.model.ilustratif:
+                    st.warning(
+                        'Skor risiko memakai koefisien bawaan yang belum dikalibrasi dan hanya bersifat '
+                        'ilustratif. Muat model terlatih (.json) untuk estimasi risiko pasien.'
+                    )
                 
                 # Jalankan analisis
-                metrics = analyzer.analisis_genetik_detail()
-                figs, risiko_data = analyzer.visualisasi_genetik(metrics)
-                laporan = analyzer.generate_laporan_genetik(metrics)
+                def hitung():
+                    metrics = analyzer.analisis_genetik_detail()
+                    figs, risiko_data = analyzer.visualisasi_genetik(metrics)
+                    return figs, risiko_data, analyzer.generate_laporan_genetik(metrics)
+                
+                figs, risiko_data, laporan = penyimpanan_sesi().ambil(
+                    ('genetik', tuple(gens), tuple(ekspresis), kunci_teks(catatan_medis), path_model), hitung
+                )
                 
                 # Tampilkan hasil
                 tabs = st.tabs([
@@ -396,16 +1365,16 @@ def main():
                 
                 # Isi tab
                 with tabs[0]:
-                    st.plotly_chart(figs[0], use_container_width=True)
+                    tampilkan_grafik(figs[0])
                 
                 with tabs[1]:
-                    st.plotly_chart(figs[1], use_container_width=True)
+                    tampilkan_grafik(figs[1])
                 
                 with tabs[2]:
-                    st.plotly_chart(figs[2], use_container_width=True)
+                    tampilkan_grafik(figs[2])
                 
                 with tabs[3]:
-                    st.plotly_chart(figs[3], use_container_width=True)
+                    tampilkan_grafik(figs[3])
                 
                 with tabs[4]:
                     st.markdown(laporan)
@@ -437,6 +1406,112 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Deret waktu panjang: WebGL di atas ambang titik dan downsampling LTTB
+AMBANG_WEBGL = 1000
+N_TITIK_MAKS = 2000
+
+def _sumbu_numerik(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    if x.dtype.kind in 'iuf':
+        return x.astype(np.float64)
+    # Kategori: gunakan posisi
+    return np.arange(len(x), dtype=np.float64)
+
+def lttb_indeks(x, y, n_keluar):
+    """Largest-Triangle-Three-Buckets: indeks titik yang mempertahankan bentuk kurva"""
+    n = len(y)
+    if n_keluar >= n or n_keluar < 3:
+        return np.arange(n)
+    x = _sumbu_numerik(x)
+    y = np.asarray(y, dtype=np.float64)
+    # Batas bucket untuk titik tengah (titik pertama & terakhir selalu dipakai)
+    batas = np.linspace(1, n - 1, n_keluar - 1).astype(np.int64)
+    rata_x = np.add.reduceat(x[1:n - 1], batas[:-1] - 1) / np.diff(batas)
+    rata_y = np.add.reduceat(y[1:n - 1], batas[:-1] - 1) / np.diff(batas)
+    indeks = np.empty(n_keluar, dtype=np.int64)
+    indeks[0], indeks[-1] = 0, n - 1
+    a = 0
+    for i in range(n_keluar - 2):
+        awal, akhir = batas[i], batas[i + 1]
+        if i + 1 < n_keluar - 2:
+            cx, cy = rata_x[i + 1], rata_y[i + 1]
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        luas = np.abs(
+            (x[a] - cx) * (y[awal:akhir] - y[a]) - (x[a] - x[awal:akhir]) * (cy - y[a])
+        )
+        a = awal + int(np.argmax(luas))
+        indeks[i + 1] = a
+    return indeks
+
+def _posisi_kategori(x, r):
+    # Label dicari pada sumbu; bilangan bulat dianggap posisi (sumbu kategori
+    # berbeda per jejak, mis. aspek tiap kategori holistik)
+    cocok = np.flatnonzero(x == r) if isinstance(r, str) else []
+    if len(cocok):
+        return int(cocok[0])
+    if isinstance(r, (int, np.integer)) and not isinstance(r, bool):
+        return int(r)
+    raise ValueError(f"Label rentang tidak ada pada sumbu: {r}")
+
+def _jendela(x, rentang):
+    # Potong ke rentang tampilan (zoom) sebelum downsampling
+    if rentang is None:
+        return slice(None)
+    x = np.asarray(x)
+    if not (np.issubdtype(x.dtype, np.datetime64) or x.dtype.kind in 'iuf'):
+        awal, akhir = sorted(_posisi_kategori(x, r) for r in rentang)
+        return slice(awal, akhir + 1)
+    sumbu = _sumbu_numerik(x)
+    awal, akhir = (_sumbu_numerik(np.asarray([r], dtype=np.asarray(x).dtype))[0] for r in rentang)
+    return slice(np.searchsorted(sumbu, awal, 'left'), np.searchsorted(sumbu, akhir, 'right'))
+
+def jejak_deret_waktu(x, y, rentang=None, n_maks=N_TITIK_MAKS, ambang_webgl=AMBANG_WEBGL, **kwargs):
+    x, y = np.asarray(x), np.asarray(y)
+    jendela = _jendela(x, rentang)
+    x, y = x[jendela], y[jendela]
+    if len(y) > n_maks:
+        indeks = lttb_indeks(x, y, n_maks)
+        x, y = x[indeks], y[indeks]
+    jenis = go.Scattergl if len(y) > ambang_webgl else go.Scatter
+    return jenis(x=x, y=y, **kwargs)
+
+def jejak_area_bertumpuk(deret, rentang=None, n_maks=N_TITIK_MAKS, **kwargs):
+    # deret: daftar (x, y, nama). Scattergl tidak mendukung stackgroup, jadi
+    # ukuran dijaga dengan LTTB; bila sumbu x sama, indeks dipilih dari total
+    # tumpukan agar semua lapisan tetap sejajar
+    deret = [(np.asarray(x), np.asarray(y, dtype=np.float64), nama) for x, y, nama in deret]
+    x0 = deret[0][0] if deret else None
+    sumbu_sama = all(len(x) == len(x0) and np.array_equal(x, x0) for x, _, _ in deret)
+    if sumbu_sama and deret:
+        jendela = _jendela(x0, rentang)
+        total = np.sum([y[jendela] for _, y, _ in deret], axis=0)
+        indeks = lttb_indeks(x0[jendela], total, n_maks) if len(total) > n_maks else np.arange(len(total))
+        return [
+            go.Scatter(x=x[jendela][indeks], y=y[jendela][indeks], stackgroup='one', name=nama, **kwargs)
+            for x, y, nama in deret
+        ]
+    jejak = []
+    for x, y, nama in deret:
+        jendela = _jendela(x, rentang)
+        x, y = x[jendela], y[jendela]
+        if len(y) > n_maks:
+            indeks = lttb_indeks(x, y, n_maks)
+            x, y = x[indeks], y[indeks]
+        jejak.append(go.Scatter(x=x, y=y, stackgroup='one', name=nama, **kwargs))
+    return jejak
+
+TAHAP_USIA = ('0-6 bulan', '6-12 bulan', '1-2 tahun', '2-3 tahun')
+
+SKEMA_PERKEMBANGAN = SkemaKategori({
+    'perkembangan_motorik': {'Kasar': TAHAP_USIA, 'Halus': TAHAP_USIA},
+    'perkembangan_kognitif': ('Perhatian', 'Memori', 'Pemecahan Masalah', 'Bahasa'),
+    'intervensi_terapi': ('Terapi Wicara', 'Terapi Okupasi', 'Terapi Fisik', 'Terapi Perilaku'),
+    'keterampilan_sosial': ('Komunikasi', 'Interaksi Sosial', 'Kemandirian', 'Emosi')
+})
+
 class SindromDownKlinisPerkembangan:
     def __init__(self, data_pasien):
         self.data = data_pasien
@@ -484,26 +1559,33 @@ class SindromDownKlinisPerkembangan:
                 'Emosi': 0.4
             }
         }
-        return metrics
+        hasil = SKEMA_PERKEMBANGAN.dari_dict(metrics)
+        
+        # Hasil pengukuran nyata (mis. dari Observation FHIR) menggantikan simulasi
+        for kolom, nilai in self.data.get('pengukuran', {}).items():
+            hasil.larik()[SKEMA_PERKEMBANGAN.kolom.index(kolom)] = nilai
+        return hasil
     
-    def visualisasi_perkembangan(self, metrics):
+    def visualisasi_perkembangan(self, metrics, rentang=None):
         figs = []
         
         # 1. Perkembangan Motorik - Line Chart
         fig_motorik = go.Figure()
         
         # Motorik Kasar
-        fig_motorik.add_trace(go.Scatter(
-            x=list(metrics['perkembangan_motorik']['Kasar'].keys()),
-            y=list(metrics['perkembangan_motorik']['Kasar'].values()),
+        fig_motorik.add_trace(jejak_deret_waktu(
+            list(metrics['perkembangan_motorik']['Kasar']),
+            metrics['perkembangan_motorik']['Kasar'].larik(),
+            rentang=rentang,
             mode='lines+markers',
             name='Motorik Kasar'
         ))
         
         # Motorik Halus
-        fig_motorik.add_trace(go.Scatter(
-            x=list(metrics['perkembangan_motorik']['Halus'].keys()),
-            y=list(metrics['perkembangan_motorik']['Halus'].values()),
+        fig_motorik.add_trace(jejak_deret_waktu(
+            list(metrics['perkembangan_motorik']['Halus']),
+            metrics['perkembangan_motorik']['Halus'].larik(),
+            rentang=rentang,
             mode='lines+markers',
             name='Motorik Halus'
         ))
@@ -518,8 +1600,8 @@ class SindromDownKlinisPerkembangan:
         
         # 2. Perkembangan Kognitif - Bar Chart
         fig_kognitif = go.Figure(data=[go.Bar(
-            x=list(metrics['perkembangan_kognitif'].keys()),
-            y=list(metrics['perkembangan_kognitif'].values()),
+            x=list(metrics['perkembangan_kognitif']),
+            y=metrics['perkembangan_kognitif'].larik(),
             marker_color='lightblue'
         )])
         fig_kognitif.update_layout(
@@ -532,8 +1614,8 @@ class SindromDownKlinisPerkembangan:
         
         # 3. Intervensi Terapi - Pie Chart
         fig_terapi = go.Figure(data=[go.Pie(
-            labels=list(metrics['intervensi_terapi'].keys()),
-            values=list(metrics['intervensi_terapi'].values()),
+            labels=list(metrics['intervensi_terapi']),
+            values=metrics['intervensi_terapi'].larik(),
             hole=0.3
         )])
         fig_terapi.update_layout(
@@ -544,8 +1626,8 @@ class SindromDownKlinisPerkembangan:
         
         # 4. Keterampilan Sosial - Radar Chart
         fig_sosial = go.Figure(data=go.Scatterpolar(
-            r=list(metrics['keterampilan_sosial'].values()),
-            theta=list(metrics['keterampilan_sosial'].keys()),
+            r=metrics['keterampilan_sosial'].larik(),
+            theta=list(metrics['keterampilan_sosial']),
             fill='toself'
         ))
         fig_sosial.update_layout(
@@ -614,6 +1696,13 @@ def main():
             default=['Terapi Wicara']
         )
     
+    # Rentang tampilan: detail dihitung ulang hanya untuk jendela ini
+    rentang = st.select_slider(
+        'Rentang Tahap Usia',
+        options=list(TAHAP_USIA),
+        value=(TAHAP_USIA[0], TAHAP_USIA[-1])
+    )
+    
     if st.button('Analisis Perkembangan', type='primary'):
         with st.spinner('Menganalisis profil perkembangan...'):
             # Inisialisasi analyzer
@@ -625,9 +1714,12 @@ def main():
             analyzer = SindromDownKlinisPerkembangan(data_pasien)
             
             # Jalankan analisis
-            metrics = analyzer.analisis_perkembangan()
-            figs = analyzer.visualisasi_perkembangan(metrics)
-            laporan = analyzer.generate_laporan_perkembangan(metrics)
+            def hitung():
+                metrics = analyzer.analisis_perkembangan()
+                figs = analyzer.visualisasi_perkembangan(metrics, rentang=rentang)
+                return figs, analyzer.generate_laporan_perkembangan(metrics)
+            
+            figs, laporan = penyimpanan_sesi().ambil(('perkembangan', usia, tuple(intervensi), rentang), hitung)
             
             # Tampilkan hasil
             tabs = st.tabs([
@@ -640,16 +1732,16 @@ def main():
             
             # Isi tab
             with tabs[0]:
-                st.plotly_chart(figs[0], use_container_width=True)
+                tampilkan_grafik(figs[0])
             
             with tabs[1]:
-                st.plotly_chart(figs[1], use_container_width=True)
+                tampilkan_grafik(figs[1])
             
             with tabs[2]:
-                st.plotly_chart(figs[2], use_container_width=True)
+                tampilkan_grafik(figs[2])
             
             with tabs[3]:
-                st.plotly_chart(figs[3], use_container_width=True)
+                tampilkan_grafik(figs[3])
             
             with tabs[4]:
                 st.markdown(laporan)
@@ -684,6 +1776,169 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from PIL import Image
 import io
+import functools
+
+SKEMA_HOLISTIK = SkemaKategori({
+    'kesehatan_medis': ('Jantung', 'Tiroid', 'Pendengaran', 'Penglihatan'),
+    'perkembangan': ('Motorik Kasar', 'Motorik Halus', 'Kognitif', 'Bahasa'),
+    'sosial_emosional': ('Interaksi Sosial', 'Regulasi Emosi', 'Kemandirian', 'Komunikasi'),
+    'intervensi': ('Terapi Wicara', 'Terapi Okupasi', 'Terapi Perilaku', 'Pendidikan Khusus')
+})
+
+class AgregatHolistik:
+    """Pivot langsung skor (pasien x kolom skema) ke grid aspek x kategori"""
+
+    def __init__(self, skema=SKEMA_HOLISTIK):
+        self.skema = skema
+        self.kategori = list(skema.akar.anak)
+        self.aspek = []
+        baris, kolom = [], []
+        for k, kategori in enumerate(self.kategori):
+            for aspek in skema.akar.anak[kategori].anak:
+                if aspek not in self.aspek:
+                    self.aspek.append(aspek)
+                baris.append(self.aspek.index(aspek))
+                kolom.append(k)
+        self._baris = np.array(baris)
+        self._kolom = np.array(kolom)
+
+    def grid(self, vektor, isi=np.nan):
+        # vektor: satu nilai per kolom skema -> grid (aspek, kategori)
+        hasil = np.full((len(self.aspek), len(self.kategori)), isi, dtype=np.float64)
+        hasil[self._baris, self._kolom] = vektor
+        return hasil
+
+    def agregasi(self, matriks, persentil=(25, 50, 75)):
+        matriks = np.asarray(matriks, dtype=np.float64)
+        jumlah = np.sum(~np.isnan(matriks), axis=0)
+        hasil = {'count': self.grid(jumlah, isi=0)}
+        if len(matriks) == 0:
+            return hasil
+        # Jalur cepat tanpa NaN: np.percentile jauh lebih murah dari nanpercentile
+        lengkap = bool(jumlah.min() == len(matriks))
+        hasil['mean'] = self.grid(matriks.mean(axis=0) if lengkap else np.nanmean(matriks, axis=0))
+        hitung_persentil = np.percentile if lengkap else np.nanpercentile
+        for p, nilai in zip(persentil, hitung_persentil(matriks.T, persentil, axis=1)):
+            hasil[f'p{p}'] = self.grid(nilai)
+        return hasil
+
+    def agregasi_kelompok(self, matriks, kelompok, persentil=(25, 50, 75)):
+        # Group-by tervektorisasi: urutkan sekali, lalu potong per kelompok
+        matriks = np.asarray(matriks, dtype=np.float64)
+        label, invers = np.unique(np.asarray(kelompok), return_inverse=True)
+        urutan = np.argsort(invers, kind='stable')
+        batas = np.searchsorted(invers[urutan], np.arange(len(label) + 1))
+        terurut = matriks.T[:, urutan]
+        return {
+            lab: self.agregasi(terurut[:, batas[i]:batas[i + 1]].T, persentil)
+            for i, lab in enumerate(label.tolist())
+        }
+
+    def figur(self, grid, judul='Integrasi dan Korelasi Aspek', label_skor='Skor'):
+        fig = go.Figure(data=go.Heatmap(
+            z=grid,
+            x=self.kategori,
+            y=self.aspek,
+            colorscale='Viridis',
+            colorbar=dict(title=label_skor)
+        ))
+        fig.update_layout(
+            title=judul,
+            xaxis_title='Kategori',
+            yaxis_title='Aspek',
+            template='plotly_dark'
+        )
+        return fig
+
+@functools.lru_cache(maxsize=None)
+def agregat_holistik(skema):
+    return AgregatHolistik(skema)
+
+# Tabel keputusan manajemen holistik (ambang berurutan menurun, perbandingan '>')
+TABEL_KEPUTUSAN_HOLISTIK = {
+    'status': {
+        'ambang': [0.75, 0.6, 0.45],
+        'label': ['Sangat Baik', 'Baik', 'Cukup', 'Perlu Perhatian']
+    },
+    'prioritas': 'aspek_terendah',
+    'rencana': {'kategori': 'intervensi', 'urutan': 'menurun'}
+}
+
+# Aturan prioritas yang dapat dirujuk tabel: (fungsi indeks, pengganti NaN).
+# Indeks pertama saat seri, sama seperti min/max(values, key=values.get)
+ATURAN_PRIORITAS = {
+    'aspek_terendah': (np.argmin, np.inf),
+    'aspek_tertinggi': (np.argmax, -np.inf)
+}
+
+def _pilih_prioritas(aturan, blok):
+    # Semantik min/max Python dengan NaN: NaN tidak pernah menggantikan kandidat,
+    # dan NaN pada aspek pertama tidak pernah tergantikan
+    fungsi, pengganti = aturan
+    nan = np.isnan(blok)
+    indeks = fungsi(np.where(nan, pengganti, blok), axis=1)
+    return np.where(nan[:, 0], 0, indeks)
+
+class MesinAturan:
+    """Tabel keputusan yang dikompilasi sekali dan dievaluasi per kohort"""
+
+    def __init__(self, skema, tabel=TABEL_KEPUTUSAN_HOLISTIK):
+        self.skema = skema
+        self.kategori = list(skema.akar.anak)
+        self.aspek = [list(skema.akar.anak[k].anak) for k in self.kategori]
+        self._blok = [(skema.akar.anak[k].awal, skema.akar.anak[k].akhir) for k in self.kategori]
+        self.ambang = np.asarray(tabel['status']['ambang'], dtype=np.float64)
+        self.label_status = np.asarray(tabel['status']['label'])
+        if tabel['prioritas'] not in ATURAN_PRIORITAS:
+            raise ValueError(f"Aturan prioritas tidak dikenal: {tabel['prioritas']}")
+        self._prioritas = ATURAN_PRIORITAS[tabel['prioritas']]
+        rencana = tabel['rencana']
+        if rencana['urutan'] not in ('menurun', 'menaik'):
+            raise ValueError(f"Urutan rencana tidak dikenal: {rencana['urutan']}")
+        self.kategori_rencana = rencana['kategori']
+        self._menurun = rencana['urutan'] == 'menurun'
+
+    def skor_kategori(self, matriks):
+        return np.stack([matriks[:, awal:akhir].mean(axis=1) for awal, akhir in self._blok], axis=1)
+
+    def status(self, skor):
+        # Jumlah ambang yang tidak dilampaui = indeks label; skor NaN tidak
+        # melampaui ambang mana pun (label terakhir), seperti rantai if/else
+        return np.where(
+            np.isnan(skor), len(self.ambang), (skor[..., np.newaxis] <= self.ambang).sum(axis=-1)
+        )
+
+    def evaluasi(self, matriks):
+        # matriks: (n_pasien, n_kolom skema)
+        matriks = np.atleast_2d(np.asarray(matriks, dtype=np.float64))
+        skor = self.skor_kategori(matriks)
+        prioritas = np.stack(
+            [_pilih_prioritas(self._prioritas, matriks[:, awal:akhir]) for awal, akhir in self._blok], axis=1
+        )
+        hasil = {'skor': skor, 'status': self.status(skor), 'prioritas': prioritas}
+        if self.kategori_rencana in self.kategori:
+            awal, akhir = self._blok[self.kategori.index(self.kategori_rencana)]
+            blok = matriks[:, awal:akhir]
+            # Urutan stabil, setara dengan sorted(..., reverse=True) per pasien;
+            # aspek NaN selalu di akhir (urutan sorted() dengan NaN tidak terdefinisi)
+            hasil['urutan_intervensi'] = np.argsort(-blok if self._menurun else blok, axis=1, kind='stable')
+        return hasil
+
+    def evaluasi_kohort(self, kohort):
+        hasil = self.evaluasi(kohort.matriks())
+        tabel = {}
+        for k, kategori in enumerate(self.kategori):
+            tabel[f'{kategori}.skor'] = hasil['skor'][:, k]
+            tabel[f'{kategori}.status'] = pd.Categorical.from_codes(hasil['status'][:, k], self.label_status)
+            tabel[f'{kategori}.prioritas'] = pd.Categorical.from_codes(hasil['prioritas'][:, k], self.aspek[k])
+        if 'urutan_intervensi' in hasil:
+            aspek_rencana = self.aspek[self.kategori.index(self.kategori_rencana)]
+            tabel['intervensi_utama'] = pd.Categorical.from_codes(hasil['urutan_intervensi'][:, 0], aspek_rencana)
+        return pd.DataFrame(tabel)
+
+@functools.lru_cache(maxsize=None)
+def mesin_aturan(skema):
+    return MesinAturan(skema)
 
 class ManajemenHolistikSindromDown:
     def __init__(self, data_pasien):
@@ -724,9 +1979,14 @@ class ManajemenHolistikSindromDown:
                 'Pendidikan Khusus': 0.58
             }
         }
-        return metrics
+        hasil = SKEMA_HOLISTIK.dari_dict(metrics)
+        
+        # Hasil pengukuran nyata menggantikan simulasi, seperti analisis perkembangan
+        for kolom, nilai in self.data.get('pengukuran', {}).items():
+            hasil.larik()[SKEMA_HOLISTIK.kolom.index(kolom)] = nilai
+        return hasil
     
-    def visualisasi_holistik(self, metrics):
+    def visualisasi_holistik(self, metrics, rentang=None):
         figs = []
         
         # 1. Radar Chart Multidimensional
@@ -736,8 +1996,8 @@ class ManajemenHolistikSindromDown:
         kategoris = list(metrics.keys())
         for kategori in kategoris:
             fig_holistik.add_trace(go.Scatterpolar(
-                r=list(metrics[kategori].values()),
-                theta=list(metrics[kategori].keys()),
+                r=metrics[kategori].larik(),
+                theta=list(metrics[kategori]),
                 fill='toself',
                 name=kategori
             ))
@@ -750,25 +2010,12 @@ class ManajemenHolistikSindromDown:
         figs.append(fig_holistik)
         
         # 2. Heatmap Integrasi Aspek
-        data_heatmap = []
-        for kategori, values in metrics.items():
-            for aspek, skor in values.items():
-                data_heatmap.append([kategori, aspek, skor])
-        
-        df_heatmap = pd.DataFrame(data_heatmap, columns=['Kategori', 'Aspek', 'Skor'])
-        
-        fig_heatmap = px.density_heatmap(
-            df_heatmap, 
-            x='Kategori', 
-            y='Aspek', 
-            z='Skor',
-            title='Integrasi dan Korelasi Aspek',
-            template='plotly_dark'
-        )
+        agregat = agregat_holistik(metrics.skema)
+        fig_heatmap = agregat.figur(agregat.grid(metrics.larik()))
         figs.append(fig_heatmap)
         
         # 3. Waterfall Chart Progres
-        progres_kumulatif = np.cumsum([np.mean(list(kategori.values())) for kategori in metrics.values()])
+        progres_kumulatif = np.cumsum([kategori.larik().mean() for kategori in metrics.values()])
         
         fig_waterfall = go.Figure(go.Waterfall(
             name="Progres Kumulatif",
@@ -789,14 +2036,11 @@ class ManajemenHolistikSindromDown:
         # 4. Kombinasi Area Chart
         fig_area = go.Figure()
         
-        for kategori, values in metrics.items():
-            fig_area.add_trace(go.Scatter(
-                x=list(values.keys()),
-                y=list(values.values()),
-                mode='lines',
-                stackgroup='one',
-                name=kategori
-            ))
+        fig_area.add_traces(jejak_area_bertumpuk(
+            [(list(values), values.larik(), kategori) for kategori, values in metrics.items()],
+            rentang=rentang,
+            mode='lines'
+        ))
         
         fig_area.update_layout(
             title='Pola Perkembangan Terintegrasi',
@@ -808,53 +2052,554 @@ class ManajemenHolistikSindromDown:
         
         return figs
     
+    def visualisasi_kohort(self, kohort, statistik='mean'):
+        # kohort: KohortHasil.untuk_skema(SKEMA_HOLISTIK)
+        agregat = agregat_holistik(SKEMA_HOLISTIK)
+        hasil = agregat.agregasi(kohort.matriks())
+        return agregat.figur(
+            hasil[statistik],
+            judul=f'Integrasi Aspek Kohort ({statistik}, n={len(kohort)})',
+            label_skor=statistik
+        )
+    
     def generate_laporan_manajemen(self, metrics):
-        # Hitung skor rata-rata
-        skor_rata_rata = {
-            kategori: np.mean(list(values.values())) 
-            for kategori, values in metrics.items()
-        }
+        # Satu evaluasi tabel keputusan untuk ringkasan, rekomendasi dan rencana
+        mesin = mesin_aturan(metrics.skema)
+        keputusan = {k: v[0] for k, v in mesin.evaluasi(metrics.larik()).items()}
         
         laporan = f"""
         ## Laporan Manajemen Holistik Sindrom Down
 
         ### Ringkasan Komprehensif
-        {self._buat_ringkasan(skor_rata_rata)}
+        {self._buat_ringkasan(mesin, keputusan)}
 
         ### Rekomendasi Spesifik
-        {self._buat_rekomendasi(metrics)}
+        {self._buat_rekomendasi(mesin, keputusan)}
 
         ### Rencana Intervensi Personal
-        {self._buat_rencana_intervensi(metrics)}
+        {self._buat_rencana_intervensi(mesin, keputusan, metrics)}
         """
         return laporan
     
-    def _buat_ringkasan(self, skor_rata_rata):
+    def _buat_ringkasan(self, mesin, keputusan):
         ringkasan = "#### Evaluasi Multidimensional\n"
-        for kategori, skor in skor_rata_rata.items():
-            status = (
-                "Sangat Baik" if skor > 0.75 else
-                "Baik" if skor > 0.6 else
-                "Cukup" if skor > 0.45 else
-                "Perlu Perhatian"
-            )
+        for k, kategori in enumerate(mesin.kategori):
+            status = mesin.label_status[keputusan['status'][k]]
+            skor = keputusan['skor'][k]
             ringkasan += f"- **{kategori}**: {status} (Skor: {skor*100:.2f}%)\n"
         return ringkasan
     
-    def _buat_rekomendasi(self, metrics):
+    def _buat_rekomendasi(self, mesin, keputusan):
         rekomendasi = "#### Fokus Pengembangan\n"
-        for kategori, values in metrics.items():
-            aspek_terendah = min(values, key=values.get)
-            rekomendasi += f"- **{kategori}**: Prioritaskan pengembangan {aspek_terendah}\n"
+        for k, kategori in enumerate(mesin.kategori):
+            aspek_prioritas = mesin.aspek[k][keputusan['prioritas'][k]]
+            rekomendasi += f"- **{kategori}**: Prioritaskan pengembangan {aspek_prioritas}\n"
         return rekomendasi
     
-    def _buat_rencana_intervensi(self, metrics):
+    def _buat_rencana_intervensi(self, mesin, keputusan, metrics):
         rencana = "#### Strategi Pendampingan\n"
-        intervensi = metrics.get('intervensi', {})
-        for terapi, intensitas in sorted(intervensi.items(), key=lambda x: x[1], reverse=True):
-            rencana += f"- **{terapi}**: Intensitas {intensitas*100:.2f}% - Lanjutkan dan optimalkan\n"
+        if 'urutan_intervensi' not in keputusan:
+            return rencana
+        intervensi = metrics[mesin.kategori_rencana]
+        aspek = mesin.aspek[mesin.kategori.index(mesin.kategori_rencana)]
+        for j in keputusan['urutan_intervensi']:
+            terapi = aspek[j]
+            rencana += f"- **{terapi}**: Intensitas {intervensi[terapi]*100:.2f}% - Lanjutkan dan optimalkan\n"
         return rencana
 
+# Agregat dasbor kohort termaterialisasi (per kelompok usia x tipe sindrom)
+import logging
+import threading
+
+log_agregat = logging.getLogger(__name__)
+
+KELOMPOK_USIA = (
+    (0, '0-1 tahun'), (12, '1-3 tahun'), (36, '3-6 tahun'), (72, '6-12 tahun'), (144, '12+ tahun')
+)
+TIPE_SINDROM = ('Trisomy 21', 'Mosaic', 'Translokasi')
+PATH_AGREGAT_KOHORT = os.environ.get('SD_AGREGAT_KOHORT', 'agregat_kohort.npz')
+
+class AgregatKohortTermaterialisasi:
+    """Statistik cukup (jumlah, total, kuadrat, histogram) per sel usia x tipe"""
+
+    def __init__(self, skema=SKEMA_HOLISTIK, n_bin=20):
+        self.skema = skema
+        self.n_bin = n_bin
+        bentuk = (len(KELOMPOK_USIA), len(TIPE_SINDROM))
+        k = len(skema)
+        self.jumlah = np.zeros(bentuk, dtype=np.int64)
+        self.total = np.zeros(bentuk + (k,))
+        self.total_kuadrat = np.zeros(bentuk + (k,))
+        self.histogram = np.zeros(bentuk + (k, n_bin), dtype=np.int64)
+        # Identitas kunjungan yang sudah dihitung: satu kunjungan satu baris
+        self.kunjungan = set()
+        self._antrean = {}
+        self._kunci = threading.Lock()
+        self._penjadwal = None
+
+    def _sel(self, usia, tipe):
+        batas = np.array([b for b, _ in KELOMPOK_USIA])
+        i_usia = np.searchsorted(batas, np.asarray(usia), side='right') - 1
+        i_tipe = pd.Categorical(np.asarray(tipe), categories=TIPE_SINDROM).codes
+        if (i_tipe < 0).any():
+            raise ValueError(f"Tipe sindrom tidak dikenal, gunakan salah satu dari {TIPE_SINDROM}")
+        return i_usia * len(TIPE_SINDROM) + i_tipe
+
+    def tambah(self, matriks, usia, tipe):
+        # Pembaruan inkremental: biaya sebanding dengan jumlah baris baru saja
+        matriks = np.atleast_2d(np.asarray(matriks, dtype=np.float64))
+        sel = self._sel(np.atleast_1d(usia), np.atleast_1d(tipe))
+        n_sel, k, b = self.jumlah.size, matriks.shape[1], self.n_bin
+        kolom = np.arange(k)
+        bin_ = np.clip((matriks * b).astype(np.int64), 0, b - 1)
+        with self._kunci:
+            self.jumlah += np.bincount(sel, minlength=n_sel).reshape(self.jumlah.shape)
+            kunci = (sel[:, np.newaxis] * k + kolom).ravel()
+            self.total += np.bincount(kunci, weights=matriks.ravel(), minlength=n_sel * k).reshape(self.total.shape)
+            self.total_kuadrat += np.bincount(
+                kunci, weights=(matriks ** 2).ravel(), minlength=n_sel * k
+            ).reshape(self.total_kuadrat.shape)
+            self.histogram += np.bincount(
+                kunci * b + bin_.ravel(), minlength=n_sel * k * b
+            ).reshape(self.histogram.shape)
+
+    def antre(self, id_kunjungan, vektor, usia, tipe):
+        # False jika kunjungan ini sudah tercatat (klik ulang tidak menambah pasien)
+        self._sel([usia], [tipe])
+        vektor = np.asarray(vektor, dtype=np.float64)
+        # Satu NaN akan meracuni total sel selamanya (dan snapshot .npz)
+        if vektor.shape != (len(self.skema),) or not np.all((vektor >= 0) & (vektor <= 1)):
+            raise ValueError(f"Vektor skor harus {len(self.skema)} nilai berhingga pada [0, 1]")
+        with self._kunci:
+            if id_kunjungan in self.kunjungan or id_kunjungan in self._antrean:
+                return False
+            self._antrean[id_kunjungan] = (vektor, usia, tipe)
+        return True
+
+    def segarkan(self):
+        with self._kunci:
+            antrean = dict(self._antrean)
+        if antrean:
+            baris = list(antrean.values())
+            self.tambah(np.stack([v for v, _, _ in baris]), [u for _, u, _ in baris], [t for _, _, t in baris])
+            with self._kunci:
+                self.kunjungan.update(antrean)
+                for id_kunjungan in antrean:
+                    del self._antrean[id_kunjungan]
+        return len(antrean)
+
+    def jadwalkan(self, interval_detik=60, path=None):
+        # Penjadwal lokal: segarkan antrean dan simpan snapshot secara berkala
+        # Snapshot yang gagal disimpan dicoba lagi pada siklus berikutnya
+        belum_disimpan = [False]
+        def siklus():
+            try:
+                belum_disimpan[0] |= bool(self.segarkan())
+                if belum_disimpan[0] and path:
+                    self.simpan(path)
+                    belum_disimpan[0] = False
+            except Exception:
+                log_agregat.exception("Penyegaran agregat kohort gagal, dicoba lagi dalam %s detik", interval_detik)
+            finally:
+                # Penjadwal tetap hidup meskipun satu siklus gagal
+                self._penjadwal = threading.Timer(interval_detik, siklus)
+                self._penjadwal.daemon = True
+                self._penjadwal.start()
+        if self._penjadwal is None:
+            siklus()
+
+    def ringkasan(self, usia=None, tipe=None):
+        # Baca agregat: gabungan paling banyak 15 sel, tidak bergantung ukuran kohort
+        i_usia = [i for i, (_, label) in enumerate(KELOMPOK_USIA) if usia in (None, label)]
+        i_tipe = [i for i, label in enumerate(TIPE_SINDROM) if tipe in (None, label)]
+        pilih = np.ix_(i_usia, i_tipe)
+        with self._kunci:
+            jumlah = int(self.jumlah[pilih].sum())
+            total = self.total[pilih].sum(axis=(0, 1))
+            total_kuadrat = self.total_kuadrat[pilih].sum(axis=(0, 1))
+            histogram = self.histogram[pilih].sum(axis=(0, 1))
+        rata = total / max(jumlah, 1)
+        return {
+            'jumlah': jumlah,
+            'rata_rata': rata,
+            'simpangan_baku': np.sqrt(np.maximum(total_kuadrat / max(jumlah, 1) - rata ** 2, 0)),
+            'histogram': histogram,
+            'persentil': {p: self.persentil(histogram, p) for p in (25, 50, 75)}
+        }
+
+    def persentil(self, histogram, p):
+        # Perkiraan dari histogram bin tetap pada [0, 1] (titik tengah bin)
+        kumulatif = np.cumsum(histogram, axis=1)
+        target = kumulatif[:, -1:] * p / 100
+        return (np.argmax(kumulatif >= target, axis=1) + 0.5) / self.n_bin
+
+    def visualisasi(self, ringkasan):
+        metrics = HasilSkor(self.skema, ringkasan['rata_rata'])
+        return ManajemenHolistikSindromDown({}).visualisasi_holistik(metrics)[:3]
+
+    def tabel_persentil(self, ringkasan):
+        return pd.DataFrame(
+            {f'P{p}': nilai for p, nilai in ringkasan['persentil'].items()},
+            index=list(self.skema.kolom)
+        ).assign(rata_rata=ringkasan['rata_rata'], simpangan_baku=ringkasan['simpangan_baku'])
+
+    def simpan(self, path):
+        # Tulis atomik (berkas sementara + os.replace): crash saat menyimpan
+        # tidak meninggalkan snapshot rusak yang gagal dimuat saat start
+        sementara = f'{path}.{os.getpid()}.tmp'
+        try:
+            with self._kunci, open(sementara, 'wb') as berkas:
+                np.savez(
+                    berkas, jumlah=self.jumlah, total=self.total,
+                    total_kuadrat=self.total_kuadrat, histogram=self.histogram,
+                    kunjungan=np.asarray(sorted(self.kunjungan), dtype=str)
+                )
+            os.replace(sementara, path)
+        finally:
+            if os.path.exists(sementara):
+                os.remove(sementara)
+
+    @classmethod
+    def muat(cls, path, skema=SKEMA_HOLISTIK):
+        with np.load(path) as berkas:
+            agregat = cls(skema, n_bin=berkas['histogram'].shape[-1])
+            agregat.jumlah = berkas['jumlah']
+            agregat.total = berkas['total']
+            agregat.total_kuadrat = berkas['total_kuadrat']
+            agregat.histogram = berkas['histogram']
+            if 'kunjungan' in berkas:
+                agregat.kunjungan = set(berkas['kunjungan'].tolist())
+        return agregat
+
+@st.cache_resource
+def agregat_kohort(path=PATH_AGREGAT_KOHORT, interval_detik=60):
+    agregat = AgregatKohortTermaterialisasi.muat(path) if os.path.exists(path) else AgregatKohortTermaterialisasi()
+    agregat.jadwalkan(interval_detik, path)
+    return agregat
+
+# Penyerapan FHIR (Bundle JSON / NDJSON) secara streaming
+class _PembacaJSONStreaming:
+    _SPASI = re.compile(r'[ \t\r\n]*')
+
+    def __init__(self, berkas, ukuran_potongan=1 << 20):
+        self.berkas = berkas
+        self.ukuran_potongan = ukuran_potongan
+        self.buf = ''
+        self.pos = 0
+        self.habis = False
+        self.byte_dibaca = 0
+        self._decoder = json.JSONDecoder()
+
+    def _isi(self):
+        # Buffer bertambah minimal dua kali lipat agar dekode ulang tetap linear
+        data = self.berkas.read(max(self.ukuran_potongan, len(self.buf) - self.pos))
+        if not data:
+            self.habis = True
+            return False
+        self.byte_dibaca += len(data)
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def karakter(self):
+        while True:
+            self.pos = self._SPASI.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._isi():
+                return self.buf[self.pos:self.pos + 1]
+
+    def harap(self, karakter):
+        if self.karakter() != karakter:
+            raise ValueError(f"JSON tidak valid: diharapkan '{karakter}' pada posisi {self.pos}")
+        self.pos += 1
+
+    def nilai(self):
+        self.karakter()
+        while True:
+            try:
+                obj, akhir = self._decoder.raw_decode(self.buf, self.pos)
+                # Angka di ujung buffer bisa saja terpotong: baca lagi bila belum EOF
+                if akhir < len(self.buf) or self.habis:
+                    self.pos = akhir
+                    return obj
+            except json.JSONDecodeError:
+                if self.habis:
+                    raise
+            self._isi()
+
+class PenyerapFHIR:
+    """Baca resource FHIR secara streaming dan petakan ke input analyzer"""
+
+    def __init__(self, peta_kode=None, ukuran_batch=5000, ukuran_potongan=1 << 20):
+        # Kode/display Observation -> ('perkembangan', kolom) atau ('genetik', gen)
+        self.peta_kode = {kolom: ('perkembangan', kolom) for kolom in SKEMA_PERKEMBANGAN.kolom}
+        self.peta_kode.update({gen: ('genetik', gen) for gen in PANEL_GEN})
+        self.peta_kode.update(peta_kode or {})
+        self.ukuran_batch = ukuran_batch
+        self.ukuran_potongan = ukuran_potongan
+
+    def resource(self, berkas):
+        if getattr(berkas, 'name', '').endswith('.ndjson'):
+            for baris in berkas:
+                if baris.strip():
+                    yield json.loads(baris)
+            return
+        pembaca = _PembacaJSONStreaming(berkas, self.ukuran_potongan)
+        pembaca.harap('{')
+        while True:
+            karakter = pembaca.karakter()
+            if karakter in ('}', ''):
+                break
+            if karakter == ',':
+                pembaca.pos += 1
+                continue
+            kunci = pembaca.nilai()
+            pembaca.harap(':')
+            if kunci != 'entry':
+                pembaca.nilai()
+                continue
+            pembaca.harap('[')
+            while True:
+                karakter = pembaca.karakter()
+                if karakter in (']', ''):
+                    break
+                if karakter == ',':
+                    pembaca.pos += 1
+                    continue
+                entry = pembaca.nilai()
+                if 'resource' in entry:
+                    yield entry['resource']
+            pembaca.harap(']')
+
+    @staticmethod
+    def _pasien(resource):
+        return resource.get('subject', {}).get('reference', '').split('/')[-1]
+
+    @staticmethod
+    def _teks_dokumen(resource):
+        bagian = []
+        for konten in resource.get('content', []):
+            lampiran = konten.get('attachment', {})
+            if 'data' in lampiran:
+                bagian.append(_b64.b64decode(lampiran['data']).decode('utf-8', errors='replace'))
+        return '\n'.join(bagian)
+
+    @staticmethod
+    def _angka(nilai):
+        # valueQuantity boleh tanpa 'value' (mis. bersama dataAbsentReason)
+        if isinstance(nilai, dict):
+            nilai = nilai.get('value')
+        if isinstance(nilai, bool) or not isinstance(nilai, (int, float)):
+            return None
+        return float(nilai)
+
+    def _nilai_observasi(self, resource):
+        # (target, None) untuk kode yang dikenal tetapi tanpa nilai numerik
+        kode = resource.get('code', {})
+        for kandidat in [c.get(k) for c in kode.get('coding', []) for k in ('code', 'display')] + [kode.get('text')]:
+            if kandidat in self.peta_kode:
+                for kunci in ('valueQuantity', 'valueDecimal', 'valueInteger'):
+                    nilai = self._angka(resource.get(kunci))
+                    if nilai is not None:
+                        return self.peta_kode[kandidat], nilai
+                return self.peta_kode[kandidat], None
+        return None, None
+
+    def batch(self, berkas):
+        batch = {'catatan': [], 'pengukuran': [], 'ekspresi': [], 'dilewati': []}
+        jumlah = 0
+        for resource in self.resource(berkas):
+            jenis = resource.get('resourceType')
+            if jenis == 'DocumentReference':
+                batch['catatan'].append((self._pasien(resource), self._teks_dokumen(resource)))
+            elif jenis == 'Observation':
+                target, nilai = self._nilai_observasi(resource)
+                if target is not None and nilai is None:
+                    batch['dilewati'].append((self._pasien(resource), target[1]))
+                elif target is not None:
+                    tujuan = 'pengukuran' if target[0] == 'perkembangan' else 'ekspresi'
+                    batch[tujuan].append((self._pasien(resource), target[1], nilai))
+            else:
+                continue
+            jumlah += 1
+            if jumlah == self.ukuran_batch:
+                yield batch
+                batch = {'catatan': [], 'pengukuran': [], 'ekspresi': [], 'dilewati': []}
+                jumlah = 0
+        if jumlah:
+            yield batch
+
+    def serap(self, path):
+        hasil = HasilPenyerapanFHIR()
+        mulai = time.perf_counter()
+        with open(path, encoding='utf-8') as berkas:
+            for batch in self.batch(berkas):
+                hasil.tambah_batch(batch)
+        hasil.statistik = {
+            'byte': os.path.getsize(path),
+            'resource': hasil.jumlah_resource,
+            'dilewati': hasil.jumlah_dilewati,
+            'detik': time.perf_counter() - mulai
+        }
+        hasil.statistik['mb_per_detik'] = hasil.statistik['byte'] / 1e6 / max(hasil.statistik['detik'], 1e-9)
+        return hasil
+
+class HasilPenyerapanFHIR:
+    def __init__(self):
+        self.id_catatan = []
+        self.profil = KohortHasil.untuk_profil_medis()
+        self.pengukuran = {}
+        self.ekspresi = {}
+        self.jumlah_resource = 0
+        self.jumlah_dilewati = 0
+        self.statistik = {}
+
+    def tambah_batch(self, batch):
+        for pasien, teks in batch['catatan']:
+            self.id_catatan.append(pasien)
+            self.profil.tambah(SindromDownAnalyzer(teks).analyze_medical_profile())
+        for pasien, kolom, nilai in batch['pengukuran']:
+            self.pengukuran.setdefault(pasien, {})[kolom] = nilai
+        for pasien, gen, nilai in batch['ekspresi']:
+            self.ekspresi.setdefault(pasien, {})[gen] = nilai
+        self.jumlah_dilewati += len(batch.get('dilewati', ()))
+        self.jumlah_resource += sum(len(v) for v in batch.values())
+
+    def analyzer_perkembangan(self, pasien):
+        return SindromDownKlinisPerkembangan({'pengukuran': self.pengukuran.get(pasien, {})})
+
+    def analyzer_genetik(self, pasien):
+        ekspresi = self.ekspresi.get(pasien, {})
+        return SindromDownGenetikAnalyzer({'gen_utama': list(ekspresi), 'ekspresi': list(ekspresi.values())})
+
+# Mode perbandingan: dua kunjungan atau dua pasien pada skema yang sama
+JENIS_PERBANDINGAN = {
+    'Perkembangan': (SKEMA_PERKEMBANGAN, lambda data: SindromDownKlinisPerkembangan(data).analisis_perkembangan()),
+    'Holistik': (SKEMA_HOLISTIK, lambda data: ManajemenHolistikSindromDown(data).analisis_komprehensif())
+}
+
+def pengukuran_dari_teks(teks, skema):
+    """Baris 'kolom = nilai' (kolom skema, nilai 0-1) menjadi dict pengukuran"""
+    pengukuran = {}
+    for baris in teks.splitlines():
+        if not baris.strip():
+            continue
+        kolom, _, nilai = baris.partition('=')
+        kolom = kolom.strip()
+        if kolom not in skema.kolom:
+            raise ValueError(f"Kolom tidak dikenal: {kolom}")
+        try:
+            angka = float(nilai)
+        except ValueError:
+            raise ValueError(f"Nilai {kolom} bukan angka: {nilai.strip()}") from None
+        # float() menerima 'nan'/'inf'; skor skema selalu berhingga pada [0, 1]
+        if not 0.0 <= angka <= 1.0:
+            raise ValueError(f"Nilai {kolom} harus antara 0 dan 1: {nilai.strip()}")
+        pengukuran[kolom] = angka
+    return pengukuran
+
+def metrik_sisi(jenis, data_pasien):
+    # Hasil per sisi disimpan dengan kunci input: sisi yang tidak berubah
+    # diambil dari penyimpanan sesi, hanya sisi baru yang dianalisis
+    skema, analisis = JENIS_PERBANDINGAN[jenis]
+    kunci = (
+        'metrik', jenis, data_pasien.get('usia'), tuple(data_pasien.get('intervensi', ())),
+        tuple(sorted(data_pasien.get('pengukuran', {}).items()))
+    )
+    return penyimpanan_sesi().ambil(kunci, lambda: analisis(data_pasien)), kunci
+
+class PerbandinganHasil:
+    """Delta antara dua HasilSkor dengan skema yang sama (B dikurangi A)"""
+
+    def __init__(self, hasil_a, hasil_b, label_a='A', label_b='B'):
+        # Kolom dibandingkan, bukan identitas: skema dibuat ulang setiap rerun skrip
+        if hasil_a.skema.kolom != hasil_b.skema.kolom:
+            raise ValueError("Kedua hasil harus memakai skema yang sama")
+        # Label menjadi nama kolom tabel per kategori, jadi harus berbeda
+        if label_a == label_b:
+            raise ValueError(f"Label kedua sisi harus berbeda (keduanya '{label_a}')")
+        self.skema = hasil_a.skema
+        self.a = hasil_a.larik()
+        self.b = hasil_b.larik()
+        self.delta = self.b - self.a
+        self.label_a = label_a
+        self.label_b = label_b
+        self.mesin = mesin_aturan(self.skema)
+
+    def per_kategori(self):
+        skor = self.mesin.skor_kategori(np.stack([self.a, self.b]))
+        status = self.mesin.status(skor)
+        return pd.DataFrame({
+            'kategori': self.mesin.kategori,
+            self.label_a: skor[0],
+            self.label_b: skor[1],
+            'delta': skor[1] - skor[0],
+            f'status {self.label_a}': self.mesin.label_status[status[0]],
+            f'status {self.label_b}': self.mesin.label_status[status[1]]
+        })
+
+    def visualisasi(self):
+        figs = []
+        kolom = list(self.skema.kolom)
+        
+        # 1. Radar overlay kedua sisi
+        fig_radar = go.Figure()
+        for label, nilai in ((self.label_a, self.a), (self.label_b, self.b)):
+            fig_radar.add_trace(go.Scatterpolar(r=nilai, theta=kolom, fill='toself', name=label))
+        fig_radar.update_layout(
+            title='Perbandingan Profil',
+            polar=dict(radialaxis=dict(visible=True, range=[0, 1])),
+            template='plotly_dark'
+        )
+        figs.append(fig_radar)
+        
+        # 2. Bar overlay per kolom
+        fig_bar = go.Figure([
+            go.Bar(x=kolom, y=self.a, name=self.label_a),
+            go.Bar(x=kolom, y=self.b, name=self.label_b)
+        ])
+        fig_bar.update_layout(title='Skor per Aspek', barmode='group', template='plotly_dark')
+        figs.append(fig_bar)
+        
+        # 3. Delta per kolom (hijau naik, merah turun)
+        fig_delta = go.Figure(go.Bar(
+            x=kolom,
+            y=self.delta,
+            marker_color=np.where(self.delta >= 0, '#2ecc71', '#e74c3c')
+        ))
+        fig_delta.update_layout(
+            title=f'Perubahan ({self.label_b} - {self.label_a})',
+            yaxis_title='Delta Skor',
+            template='plotly_dark'
+        )
+        figs.append(fig_delta)
+        
+        return figs
+
+    def generate_laporan_perubahan(self, ambang=0.05, n_teratas=3):
+        laporan = f"## Laporan Perubahan: {self.label_a} → {self.label_b}\n\n### Ringkasan per Kategori\n"
+        for _, baris in self.per_kategori().iterrows():
+            status_a, status_b = baris[f'status {self.label_a}'], baris[f'status {self.label_b}']
+            perubahan_status = f"{status_a} → {status_b}" if status_a != status_b else status_b
+            laporan += (
+                f"- **{baris['kategori']}**: {baris[self.label_a]*100:.2f}% → {baris[self.label_b]*100:.2f}% "
+                f"({baris['delta']*100:+.2f} poin, {perubahan_status})\n"
+            )
+        
+        berubah = np.abs(self.delta) >= ambang
+        laporan += f"\n### Aspek Berubah (|delta| ≥ {ambang*100:.0f} poin): {berubah.sum()} dari {len(self.delta)}\n"
+        urutan = np.argsort(self.delta, kind='stable')
+        # Tanda delta disaring: aspek yang turun tidak pernah tampil sebagai peningkatan
+        naik = [i for i in urutan[::-1] if berubah[i] and self.delta[i] > 0]
+        turun = [i for i in urutan if berubah[i] and self.delta[i] < 0]
+        for judul, indeks in (('Peningkatan Terbesar', naik), ('Penurunan Terbesar', turun)):
+            pilihan = indeks[:n_teratas]
+            if pilihan:
+                laporan += f"\n#### {judul}\n" + "".join(
+                    f"- **{self.skema.kolom[i]}**: {self.a[i]*100:.2f}% → {self.b[i]*100:.2f}% ({self.delta[i]*100:+.2f} poin)\n"
+                    for i in pilihan
+                )
+        return laporan
+
 def main():
     st.set_page_config(
         page_title="Manajemen Holistik Sindrom Down",
@@ -871,6 +2616,9 @@ def main():
             "Profil Pasien", 
             "Analisis Komprehensif", 
             "Rencana Intervensi",
+            "Perbandingan Pasien",
+            "Dasbor Kohort",
+            "Diagnostik Memori",
             "Edukasi & Dukungan"
         ]
     )
@@ -881,6 +2629,7 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
+            id_pasien = st.text_input("ID Pasien (No. Rekam Medis)")
             nama = st.text_input("Nama Pasien")
             usia = st.number_input("Usia (bulan)", min_value=0, max_value=240, value=36)
         
@@ -892,26 +2641,85 @@ def main():
             )
         
         if st.button("Buat Profil"):
-            st.success(f"Profil {nama} berhasil dibuat!")
+            if not id_pasien.strip():
+                st.error("ID Pasien wajib diisi")
+            else:
+                # Profil sesi ini dipakai Analisis Komprehensif sebagai identitas pasien
+                st.session_state['profil_pasien'] = {
+                    'id': id_pasien.strip(),
+                    'nama': nama,
+                    'usia': usia,
+                    'jenis_kelamin': jenis_kelamin,
+                    'tipe_sindrom_down': tipe_sindrom_down
+                }
+                st.success(f"Profil {nama} berhasil dibuat!")
     
     elif menu == "Analisis Komprehensif":
         st.header("Analisis Multidimensional")
         
+        # Rentang aspek (posisi dalam tiap kategori) untuk grafik pola perkembangan
+        n_aspek = max(len(simpul.anak) for simpul in SKEMA_HOLISTIK.akar.anak.values())
+        rentang = st.select_slider(
+            "Rentang Aspek",
+            options=list(range(n_aspek)),
+            value=(0, n_aspek - 1),
+            format_func=lambda i: f"Aspek {i + 1}"
+        )
+        
+        profil = st.session_state.get('profil_pasien')
+        if profil:
+            st.caption(
+                f"Pasien: {profil['nama']} ({profil['id']}), {profil['usia']} bulan, {profil['tipe_sindrom_down']}"
+            )
+        else:
+            st.info("Belum ada profil pasien: analisis memakai data contoh dan tidak masuk dasbor kohort.")
+        
+        tanggal_kunjungan = st.date_input("Tanggal Kunjungan")
+        teks_pengukuran = st.text_area(
+            "Pengukuran (satu 'kolom = nilai' per baris)",
+            help="Dasbor kohort hanya menerima kunjungan dengan seluruh kolom terukur: " + ", ".join(SKEMA_HOLISTIK.kolom)
+        )
+        
         # Tombol untuk memulai analisis
         if st.button("Jalankan Analisis Holistik"):
             with st.spinner('Menganalisis data pasien...'):
                 # Inisialisasi analyzer
-                data_pasien = {
+                data_pasien = dict(profil) if profil else {
                     'nama': 'Contoh Pasien',
-                    'usia': 36
+                    'usia': 36,
+                    'tipe_sindrom_down': 'Trisomy 21'
                 }
+                try:
+                    data_pasien['pengukuran'] = pengukuran_dari_teks(teks_pengukuran, SKEMA_HOLISTIK)
+                except ValueError as e:
+                    st.error(f"Input tidak valid: {e}")
+                    st.stop()
                 
                 analyzer = ManajemenHolistikSindromDown(data_pasien)
                 
                 # Jalankan analisis
                 metrics = analyzer.analisis_komprehensif()
-                figs = analyzer.visualisasi_holistik(metrics)
-                laporan = analyzer.generate_laporan_manajemen(metrics)
+                
+                # Dasbor kohort hanya menerima kunjungan pasien terdaftar yang seluruh
+                # aspeknya terukur (bukan nilai simulasi), sekali per kunjungan
+                if profil and len(data_pasien['pengukuran']) == len(SKEMA_HOLISTIK):
+                    tercatat = agregat_kohort().antre(
+                        f"{profil['id']}|{tanggal_kunjungan.isoformat()}",
+                        metrics.larik(), profil['usia'], profil['tipe_sindrom_down']
+                    )
+                    if tercatat:
+                        st.success("Kunjungan dicatat di dasbor kohort.")
+                    else:
+                        st.info("Kunjungan ini sudah tercatat di dasbor kohort.")
+                
+                def hitung():
+                    figs = analyzer.visualisasi_holistik(metrics, rentang=rentang)
+                    return figs, analyzer.generate_laporan_manajemen(metrics)
+                
+                figs, laporan = penyimpanan_sesi().ambil(
+                    ('holistik', data_pasien['usia'], data_pasien['tipe_sindrom_down'], metrics.larik().tobytes(), rentang),
+                    hitung
+                )
                 
                 # Tampilkan hasil
                 tabs = st.tabs([
@@ -924,16 +2732,16 @@ def main():
                 
                 # Isi tab
                 with tabs[0]:
-                    st.plotly_chart(figs[0], use_container_width=True)
+                    tampilkan_grafik(figs[0])
                 
                 with tabs[1]:
-                    st.plotly_chart(figs[1], use_container_width=True)
+                    tampilkan_grafik(figs[1])
                 
                 with tabs[2]:
-                    st.plotly_chart(figs[2], use_container_width=True)
+                    tampilkan_grafik(figs[2])
                 
                 with tabs[3]:
-                    st.plotly_chart(figs[3], use_container_width=True)
+                    tampilkan_grafik(figs[3])
                 
                 with tabs[4]:
                     st.markdown(laporan)
@@ -962,6 +2770,144 @@ def main():
             intervensi_options
         )
     
+    elif menu == "Perbandingan Pasien":
+        st.header("Perbandingan Kunjungan atau Pasien")
+        
+        jenis = st.radio("Jenis Analisis", list(JENIS_PERBANDINGAN), horizontal=True)
+        skema = JENIS_PERBANDINGAN[jenis][0]
+        
+        sisi = []
+        for i, (kolom_ui, label, usia_awal) in enumerate(zip(st.columns(2), ["Kunjungan Sebelumnya", "Kunjungan Ini"], [24, 36])):
+            with kolom_ui:
+                st.subheader(label)
+                label = st.text_input("Label", label, key=f"label_{i}")
+                usia = st.number_input("Usia (bulan)", min_value=0, max_value=240, value=usia_awal, key=f"usia_{i}")
+                intervensi = st.multiselect(
+                    "Terapi yang Diikuti",
+                    ['Terapi Wicara', 'Terapi Okupasi', 'Terapi Fisik', 'Terapi Perilaku'],
+                    default=['Terapi Wicara'],
+                    key=f"intervensi_{i}"
+                )
+                teks_pengukuran = st.text_area(
+                    "Pengukuran (satu 'kolom = nilai' per baris)",
+                    key=f"pengukuran_{i}",
+                    help="Kolom yang tersedia: " + ", ".join(skema.kolom)
+                )
+                sisi.append((label, usia, intervensi, teks_pengukuran))
+        
+        if st.button("Bandingkan", type="primary"):
+            try:
+                hasil, kunci = [], []
+                for label, usia, intervensi, teks_pengukuran in sisi:
+                    metrics, kunci_sisi = metrik_sisi(jenis, {
+                        'usia': usia,
+                        'intervensi': intervensi,
+                        'pengukuran': pengukuran_dari_teks(teks_pengukuran, skema)
+                    })
+                    hasil.append(metrics)
+                    kunci.append(kunci_sisi)
+                
+                # Grafik dan laporan perbandingan dihitung sekali per pasangan sisi
+                def hitung():
+                    perbandingan = PerbandinganHasil(hasil[0], hasil[1], sisi[0][0], sisi[1][0])
+                    return (
+                        perbandingan.visualisasi(),
+                        perbandingan.per_kategori(),
+                        perbandingan.generate_laporan_perubahan()
+                    )
+                
+                figs, tabel, laporan = penyimpanan_sesi().ambil(
+                    ('perbandingan', kunci[0], kunci[1], sisi[0][0], sisi[1][0]), hitung
+                )
+                
+                tabs = st.tabs(['Radar Overlay', 'Bar Overlay', 'Delta', 'Laporan Perubahan'])
+                
+                with tabs[0]:
+                    tampilkan_grafik(figs[0])
+                
+                with tabs[1]:
+                    tampilkan_grafik(figs[1])
+                
+                with tabs[2]:
+                    tampilkan_grafik(figs[2])
+                
+                with tabs[3]:
+                    st.dataframe(tabel.round(3))
+                    st.markdown(laporan)
+            
+            except ValueError as e:
+                st.error(f"Input tidak valid: {e}")
+    
+    elif menu == "Dasbor Kohort":
+        st.header("Dasbor Kohort Klinik")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            usia = st.selectbox("Kelompok Usia", ["Semua"] + [label for _, label in KELOMPOK_USIA])
+        
+        with col2:
+            tipe = st.selectbox("Tipe Sindrom Down", ["Semua"] + list(TIPE_SINDROM))
+        
+        # Dasbor hanya membaca agregat termaterialisasi
+        agregat = agregat_kohort()
+        ringkasan = agregat.ringkasan(
+            None if usia == "Semua" else usia,
+            None if tipe == "Semua" else tipe
+        )
+        st.metric("Jumlah Kunjungan", ringkasan['jumlah'])
+        
+        if ringkasan['jumlah'] == 0:
+            st.info("Belum ada kunjungan tercatat untuk filter ini.")
+        else:
+            figs = agregat.visualisasi(ringkasan)
+            
+            tabs = st.tabs(['Radar Holistik', 'Progresivitas', 'Peta Integrasi', 'Persentil'])
+            
+            with tabs[0]:
+                tampilkan_grafik(figs[0])
+            
+            with tabs[1]:
+                tampilkan_grafik(figs[2])
+            
+            with tabs[2]:
+                tampilkan_grafik(figs[1])
+            
+            with tabs[3]:
+                st.dataframe(agregat.tabel_persentil(ringkasan).round(3))
+    
+    elif menu == "Diagnostik Memori":
+        st.header("Diagnostik Memori Sesi")
+        
+        registri = registri_sesi()
+        penyimpanan = penyimpanan_sesi()
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("Memori Sesi Ini", f"{penyimpanan.byte / 2**20:.2f} MB")
+        
+        with col2:
+            st.metric("Anggaran per Sesi", f"{registri.anggaran_byte / 2**20:.1f} MB")
+        
+        # Sesi lain hanya terlihat oleh admin (SD_DIAGNOSTIK_ADMIN=1)
+        tabel_sesi = registri.diagnostik(id_sesi(), semua_sesi=DIAGNOSTIK_ADMIN)
+        if DIAGNOSTIK_ADMIN:
+            st.subheader(f"Memori per Sesi ({len(tabel_sesi)} sesi aktif)")
+        else:
+            st.subheader("Statistik Sesi Ini")
+        st.dataframe(tabel_sesi.round(2))
+        
+        st.subheader("Entri Sesi Ini (terbaru dahulu)")
+        st.dataframe(pd.DataFrame(
+            [(kunci[0], byte / 2**10) for kunci, byte in penyimpanan.rincian()],
+            columns=['analisis', 'memori_kb']
+        ).round(1))
+        
+        if st.button("Kosongkan Sesi Ini"):
+            penyimpanan.kosongkan()
+            st.success("Hasil tersimpan dikosongkan; analisis berikutnya dihitung ulang.")
+    
     else:
         st.header("Edukasi & Sumber Daya")
         
@@ -0,0 +1,73 @@
+"""Benchmark throughput penyerapan FHIR pada Bundle sintetis berukuran besar
+
+Pemakaian:
+    python benchmark_fhir.py --ukuran-mb 2048 --path /tmp/bundle_sintetis.json
+"""
+import argparse
+import base64
+import json
+import os
+import random
+
+from app import PANEL_GEN, SKEMA_PERKEMBANGAN, PenyerapFHIR
+
+CONTOH_CATATAN = [
+    "Patient with trisomy 21, congenital heart disease and low muscle tone. Early intervention and speech therapy ongoing.",
+    "Mosaic Down syndrome. Hearing loss noted, thyroid monitored. Occupational therapy and educational support.",
+    "Developmental delay and speech delay. Social skills improving, inclusion at school, good quality of life.",
+]
+
+def buat_bundle_sintetis(path, ukuran_mb, jumlah_pasien=10000, seed=0):
+    acak = random.Random(seed)
+    target = ukuran_mb * 1024 * 1024
+    with open(path, 'w', encoding='utf-8') as berkas:
+        berkas.write('{"resourceType":"Bundle","type":"collection","entry":[')
+        pertama = True
+        while berkas.tell() < target:
+            pasien = f"Patient/{acak.randrange(jumlah_pasien)}"
+            jenis = acak.random()
+            if jenis < 0.2:
+                teks = acak.choice(CONTOH_CATATAN)
+                resource = {
+                    'resourceType': 'DocumentReference',
+                    'subject': {'reference': pasien},
+                    'content': [{'attachment': {
+                        'contentType': 'text/plain',
+                        'data': base64.b64encode(teks.encode('utf-8')).decode('ascii')
+                    }}]
+                }
+            else:
+                kode = acak.choice(SKEMA_PERKEMBANGAN.kolom if jenis < 0.6 else PANEL_GEN)
+                resource = {
+                    'resourceType': 'Observation',
+                    'status': 'final',
+                    'subject': {'reference': pasien},
+                    'code': {'coding': [{'system': 'urn:sindrom-down', 'code': kode}]},
+                    'valueQuantity': {'value': round(acak.random(), 3)}
+                }
+            if not pertama:
+                berkas.write(',')
+            berkas.write(json.dumps({'resource': resource}))
+            pertama = False
+        berkas.write(']}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ukuran-mb', type=int, default=256)
+    parser.add_argument('--path', default='bundle_sintetis.json')
+    parser.add_argument('--ukuran-batch', type=int, default=5000)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path) or os.path.getsize(args.path) < args.ukuran_mb * 1024 * 1024:
+        buat_bundle_sintetis(args.path, args.ukuran_mb)
+
+    hasil = PenyerapFHIR(ukuran_batch=args.ukuran_batch).serap(args.path)
+    statistik = hasil.statistik
+    print(f"Ukuran    : {statistik['byte'] / 1e6:,.1f} MB")
+    print(f"Resource  : {statistik['resource']:,} (dilewati tanpa nilai: {statistik['dilewati']:,})")
+    print(f"Waktu     : {statistik['detik']:.2f} s")
+    print(f"Throughput: {statistik['mb_per_detik']:.1f} MB/s, {statistik['resource'] / statistik['detik']:,.0f} resource/s")
+    print(f"Catatan   : {len(hasil.id_catatan):,}, pasien terukur: {len(hasil.pengukuran):,}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# Direktori akar ada di sys.path agar tests/ dapat mengimpor app.py
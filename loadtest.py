@@ -0,0 +1,203 @@
+"""Uji beban sesi bersamaan: latensi rerun p50/p95/p99, CPU dan RSS puncak
+
+Setiap sesi dijalankan oleh streamlit.testing.v1.AppTest (tanpa browser) di
+thread terpisah; setiap skenario berjalan di proses baru agar RSS puncak
+terukur per skenario.
+
+Pemakaian:
+    python loadtest.py --sesi 8 --iterasi 5
+    python loadtest.py --skenario "Analisis Komprehensif" --json hasil.json
+"""
+import argparse
+import ast
+import itertools
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app import SKEMA_HOLISTIK
+
+PATH_APP = 'app.py'
+
+# ast.parse tidak aman dipanggil bersamaan dari banyak thread di CPython 3.11
+# ("AST constructor recursion depth mismatch"); Streamlit mem-parse skrip
+# pada setiap rerun, jadi kompilasi diserialkan khusus di harness ini
+_ast_parse = ast.parse
+_kunci_ast = threading.Lock()
+
+def _ast_parse_terkunci(*args, **kwargs):
+    with _kunci_ast:
+        return _ast_parse(*args, **kwargs)
+
+ast.parse = _ast_parse_terkunci
+
+def _siapkan_apptest_bersamaan():
+    # AppTest memasang Runtime tiruan global di awal setiap run dan
+    # mengosongkannya di akhir; dengan banyak sesi paralel, sesi lain yang
+    # masih berjalan akan kehilangan runtime. Runtime tiruan terakhir dipakai
+    # bersama, sama seperti satu replika server melayani banyak sesi.
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1.util import patch_config_options
+
+    terakhir = [None]
+    instance_asli = Runtime.instance.__func__
+
+    def instance(cls):
+        if cls._instance is not None:
+            terakhir[0] = cls._instance
+            return cls._instance
+        return terakhir[0] if terakhir[0] is not None else instance_asli(cls)
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or terakhir[0] is not None)
+    # Opsi global.appTest dipulihkan tiap run; tetapkan untuk seluruh proses
+    # (referensi disimpan agar patch tidak dilepas oleh garbage collector)
+    global _patch_config
+    _patch_config = patch_config_options({'global.appTest': True})
+    _patch_config.__enter__()
+
+def _tombol(at, label):
+    return next(b for b in at.button if b.label == label)
+
+def _menu(at, pilihan):
+    return at.sidebar.radio[0].set_value(pilihan).run()
+
+def _isi(elemen, label, nilai):
+    return next(e for e in elemen if e.label == label).set_value(nilai).run()
+
+# ID pasien unik per sesi agar setiap kunjungan benar-benar masuk antrean kohort
+_nomor_pasien = itertools.count()
+
+def _buat_profil(at):
+    at = _isi(at.text_input, 'ID Pasien (No. Rekam Medis)', f'LT-{os.getpid()}-{next(_nomor_pasien)}')
+    at = _isi(at.text_input, 'Nama Pasien', 'Pasien Uji Beban')
+    return _tombol(at, 'Buat Profil').click().run()
+
+def _isi_pengukuran(at):
+    teks = '\n'.join(f'{kolom} = 0.6' for kolom in SKEMA_HOLISTIK.kolom)
+    return _isi(at.text_area, "Pengukuran (satu 'kolom = nilai' per baris)", teks)
+
+SKENARIO = {
+    'Profil Pasien': [
+        lambda at: _menu(at, 'Profil Pasien'),
+        _buat_profil,
+    ],
+    'Analisis Komprehensif': [
+        lambda at: _menu(at, 'Profil Pasien'),
+        _buat_profil,
+        lambda at: _menu(at, 'Analisis Komprehensif'),
+        _isi_pengukuran,
+        lambda at: _tombol(at, 'Jalankan Analisis Holistik').click().run(),
+    ],
+    'Rencana Intervensi': [
+        lambda at: _menu(at, 'Rencana Intervensi'),
+        lambda at: at.multiselect[-1].set_value(['Terapi Wicara', 'Terapi Okupasi']).run(),
+    ],
+    'Perbandingan Pasien': [
+        lambda at: _menu(at, 'Perbandingan Pasien'),
+        lambda at: at.text_area(key='pengukuran_1').set_value('perkembangan_kognitif.Memori = 0.7').run(),
+        lambda at: _tombol(at, 'Bandingkan').click().run(),
+    ],
+    'Analisis Profil Medis': [
+        lambda at: _tombol(at, 'Analisis Profil Medis').click().run(),
+    ],
+    'Analisis Genetik': [
+        lambda at: _tombol(at, 'Analisis Genetik Mendalam').click().run(),
+    ],
+    'Analisis Perkembangan': [
+        lambda at: _tombol(at, 'Analisis Perkembangan').click().run(),
+    ],
+}
+
+def _sesi(nama_skenario, iterasi, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    latensi = []
+    galat = 0
+    for _ in range(iterasi):
+        mulai = time.perf_counter()
+        at = AppTest.from_file(PATH_APP, default_timeout=timeout).run()
+        latensi.append(time.perf_counter() - mulai)
+        galat += len(at.exception)
+        for langkah in SKENARIO[nama_skenario]:
+            mulai = time.perf_counter()
+            try:
+                at = langkah(at)
+            except (IndexError, StopIteration):
+                # Elemen yang diharapkan tidak muncul: rerun sebelumnya gagal
+                galat += 1
+                break
+            latensi.append(time.perf_counter() - mulai)
+            # st.error berarti alur gagal (mis. profil tanpa ID), bukan rerun sukses
+            galat += len(at.exception) + len(at.error)
+    return latensi, galat
+
+def jalankan_skenario(nama_skenario, sesi, iterasi, timeout=60):
+    _siapkan_apptest_bersamaan()
+    # Pemanasan: impor modul dan kompilasi pertama tidak ikut diukur
+    _sesi(nama_skenario, 1, timeout)
+    wall_mulai = time.perf_counter()
+    cpu_mulai = time.process_time()
+    with ThreadPoolExecutor(max_workers=sesi) as eksekutor:
+        hasil = list(eksekutor.map(lambda _: _sesi(nama_skenario, iterasi, timeout), range(sesi)))
+    wall = time.perf_counter() - wall_mulai
+    cpu = time.process_time() - cpu_mulai
+
+    latensi = np.concatenate([np.asarray(l) for l, _ in hasil]) * 1000
+    p50, p95, p99 = np.percentile(latensi, [50, 95, 99])
+    # ru_maxrss dalam KB di Linux, byte di macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+    return {
+        'skenario': nama_skenario,
+        'sesi': sesi,
+        'rerun': int(len(latensi)),
+        'galat': int(sum(g for _, g in hasil)),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'rerun_per_detik': len(latensi) / wall,
+        'cpu_detik': cpu,
+        'cpu_persen': 100 * cpu / wall,
+        'rss_puncak_mb': rss_mb,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sesi', type=int, default=4, help='jumlah sesi bersamaan')
+    parser.add_argument('--iterasi', type=int, default=3, help='pengulangan skenario per sesi')
+    parser.add_argument('--skenario', action='append', choices=list(SKENARIO))
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--json', help='simpan hasil untuk pemeriksaan regresi')
+    args = parser.parse_args()
+
+    # Kunjungan uji tidak boleh masuk agregat kohort klinik yang sebenarnya
+    os.environ.setdefault('SD_AGREGAT_KOHORT', os.path.join(tempfile.mkdtemp(), 'agregat_kohort_uji.npz'))
+    
+    # Proses baru per skenario agar RSS puncak tidak tercampur
+    konteks = multiprocessing.get_context('spawn')
+    semua = []
+    for nama in args.skenario or list(SKENARIO):
+        with konteks.Pool(1) as pool:
+            hasil = pool.apply(jalankan_skenario, (nama, args.sesi, args.iterasi, args.timeout))
+        semua.append(hasil)
+        print(
+            f"{hasil['skenario']:<24} sesi={hasil['sesi']:<3} rerun={hasil['rerun']:<5} "
+            f"p50={hasil['p50_ms']:8.1f} ms  p95={hasil['p95_ms']:8.1f} ms  p99={hasil['p99_ms']:8.1f} ms  "
+            f"CPU={hasil['cpu_persen']:5.0f}%  RSS={hasil['rss_puncak_mb']:7.1f} MB  galat={hasil['galat']}"
+        )
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as berkas:
+            json.dump(semua, berkas, indent=2)
+
+if __name__ == '__main__':
+    main()
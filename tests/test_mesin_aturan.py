@@ -0,0 +1,99 @@
+"""Laporan dari tabel keputusan harus identik dengan aturan if/else semula"""
+import copy
+
+import numpy as np
+import pytest
+
+import app
+
+
+def _laporan_semula(metrics):
+    # Aturan sebelum tabel keputusan (ManajemenHolistikSindromDown semula)
+    ringkasan = "#### Evaluasi Multidimensional\n"
+    for kategori, values in metrics.items():
+        skor = np.mean(list(values.values()))
+        status = (
+            "Sangat Baik" if skor > 0.75 else
+            "Baik" if skor > 0.6 else
+            "Cukup" if skor > 0.45 else
+            "Perlu Perhatian"
+        )
+        ringkasan += f"- **{kategori}**: {status} (Skor: {skor*100:.2f}%)\n"
+    rekomendasi = "#### Fokus Pengembangan\n"
+    for kategori, values in metrics.items():
+        rekomendasi += f"- **{kategori}**: Prioritaskan pengembangan {min(values, key=values.get)}\n"
+    rencana = "#### Strategi Pendampingan\n"
+    for terapi, intensitas in sorted(metrics.get('intervensi', {}).items(), key=lambda x: x[1], reverse=True):
+        rencana += f"- **{terapi}**: Intensitas {intensitas*100:.2f}% - Lanjutkan dan optimalkan\n"
+    return f"""
+        ## Laporan Manajemen Holistik Sindrom Down
+
+        ### Ringkasan Komprehensif
+        {ringkasan}
+
+        ### Rekomendasi Spesifik
+        {rekomendasi}
+
+        ### Rencana Intervensi Personal
+        {rencana}
+        """
+
+
+def test_laporan_identik_dengan_aturan_semula():
+    acak = np.random.default_rng(0)
+    # Pembulatan 2 desimal memunculkan skor seri dan skor tepat di ambang
+    matriks = np.round(acak.random((3000, len(app.SKEMA_HOLISTIK))), 2)
+    manajemen = app.ManajemenHolistikSindromDown({})
+    for baris in matriks:
+        metrics = app.HasilSkor(app.SKEMA_HOLISTIK, baris)
+        assert manajemen.generate_laporan_manajemen(metrics) == _laporan_semula(metrics.ke_dict())
+
+
+def test_laporan_identik_dengan_aturan_semula_untuk_nan():
+    acak = np.random.default_rng(2)
+    matriks = np.round(acak.random((500, len(app.SKEMA_HOLISTIK))), 2)
+    # NaN di kategori selain intervensi (urutan sorted() dengan NaN tidak terdefinisi),
+    # termasuk pada aspek pertama kategori
+    mesin = app.mesin_aturan(app.SKEMA_HOLISTIK)
+    awal, akhir = mesin._blok[mesin.kategori.index(mesin.kategori_rencana)]
+    bisa_nan = np.setdiff1d(np.arange(len(app.SKEMA_HOLISTIK)), np.arange(awal, akhir))
+    matriks[:, bisa_nan] = np.where(acak.random((500, len(bisa_nan))) < 0.2, np.nan, matriks[:, bisa_nan])
+    manajemen = app.ManajemenHolistikSindromDown({})
+    for baris in matriks:
+        metrics = app.HasilSkor(app.SKEMA_HOLISTIK, baris)
+        assert manajemen.generate_laporan_manajemen(metrics) == _laporan_semula(metrics.ke_dict())
+
+
+def test_intervensi_nan_di_akhir_rencana():
+    mesin = app.mesin_aturan(app.SKEMA_HOLISTIK)
+    awal, akhir = mesin._blok[mesin.kategori.index(mesin.kategori_rencana)]
+    baris = np.full(len(app.SKEMA_HOLISTIK), 0.5)
+    baris[awal:akhir] = [0.4, np.nan, 0.9, 0.6]
+    hasil = mesin.evaluasi(baris)
+    assert hasil['urutan_intervensi'][0].tolist() == [2, 3, 0, 1]
+    assert mesin.label_status[hasil['status'][0]].tolist()[mesin.kategori.index(mesin.kategori_rencana)] == 'Perlu Perhatian'
+
+
+def test_evaluasi_kohort_sama_dengan_evaluasi_per_pasien():
+    acak = np.random.default_rng(1)
+    matriks = np.round(acak.random((200, len(app.SKEMA_HOLISTIK))), 1)
+    mesin = app.mesin_aturan(app.SKEMA_HOLISTIK)
+    kohort = mesin.evaluasi(matriks)
+    for i, baris in enumerate(matriks):
+        tunggal = mesin.evaluasi(baris)
+        for kunci, nilai in tunggal.items():
+            np.testing.assert_array_equal(nilai[0], kohort[kunci][i])
+
+
+def test_aturan_prioritas_dari_tabel():
+    tabel = copy.deepcopy(app.TABEL_KEPUTUSAN_HOLISTIK)
+    tabel['prioritas'] = 'aspek_tertinggi'
+    mesin = app.MesinAturan(app.SKEMA_HOLISTIK, tabel)
+    metrics = app.ManajemenHolistikSindromDown({}).analisis_komprehensif()
+    prioritas = mesin.evaluasi(metrics.larik())['prioritas'][0]
+    for k, kategori in enumerate(mesin.kategori):
+        assert mesin.aspek[k][prioritas[k]] == max(metrics[kategori], key=metrics[kategori].get)
+
+    tabel['prioritas'] = 'aspek_acak'
+    with pytest.raises(ValueError):
+        app.MesinAturan(app.SKEMA_HOLISTIK, tabel)